@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""
+Measures the time it takes to import the multipleformwizard package, compared
+to importing its views, each in a fresh interpreter.
+
+    python benchmarks/import_time.py [--runs 20]
+"""
+from __future__ import print_function
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STATEMENT = """
+import time
+start = time.time()
+import %s
+print(time.time() - start)
+"""
+
+
+def measure(module, runs):
+    timings = []
+    for i in range(runs):
+        output = subprocess.check_output([sys.executable, '-c', STATEMENT % module], cwd=ROOT)
+        timings.append(float(output.decode('ascii').strip().splitlines()[-1]))
+    timings.sort()
+    return timings[len(timings) // 2], timings[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    for module in ('multipleformwizard', 'multipleformwizard.views'):
+        median, best = measure(module, args.runs)
+        print('import %-26s median %7.2f ms, best %7.2f ms' % (module, median * 1000, best * 1000))
+
+
+if __name__ == '__main__':
+    main()
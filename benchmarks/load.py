@@ -0,0 +1,337 @@
+#!/usr/bin/env python
+"""
+Runs wizards through many concurrent simulated users, against a local
+threaded WSGI server backed by SQLite and the locmem cache, and reports the
+throughput, latency percentiles and storage conflicts per view class and
+storage backend.
+
+Every simulated user has its own cookies and runs the wizard in `--tabs`
+interleaved tabs: all tabs load the wizard, then submit their first step, and
+so on. A tab counts a conflict when the wizard shows another step than the
+one it expects, or completes with the data of another tab. The users are
+spread over a pool of `--workers` threads or processes.
+
+    python benchmarks/load.py [--users 50] [--tabs 2] [--workers 8] [--pool thread|process]
+                              [--views session,cookie,...] [--session-engines db,cache,...]
+"""
+from __future__ import print_function
+import argparse
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+import six
+from six.moves import socketserver
+from six.moves.http_cookiejar import CookieJar
+from six.moves.urllib.error import HTTPError, URLError
+from six.moves.urllib.parse import urlencode
+from six.moves.urllib.request import HTTPCookieProcessor, build_opener
+
+try:
+    from html import unescape
+except ImportError:  # Python 2
+    from HTMLParser import HTMLParser
+    unescape = HTMLParser().unescape
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+}
+
+# The data submitted per step, `%(name)s` is replaced by the name of the tab
+STEPS = (
+    ('start', {'start-name': '%(name)s'}),
+    ('address', {'address-street': 'Main street', 'address-city': 'Ghent'}),
+)
+
+INPUT_RE = re.compile(r'<input\b[^>]*>')
+ATTRIBUTE_RE = re.compile(r'(\w+)="([^"]*)"')
+
+
+def setup_django(database):
+    import django
+    from django.conf import settings
+
+    settings.configure(
+        DEBUG=False,
+        ALLOWED_HOSTS=['*'],
+        SECRET_KEY='multipleformwizard-benchmarks',
+        DATABASES={
+            'default': {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': database,
+                'OPTIONS': {'timeout': 30},
+            },
+        },
+        CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        },
+        INSTALLED_APPS=[
+            'django.contrib.contenttypes',
+            'django.contrib.sessions',
+            'multipleformwizard',
+        ],
+        MIDDLEWARE_CLASSES=['django.contrib.sessions.middleware.SessionMiddleware'],
+        TEMPLATES=[{
+            'BACKEND': 'django.template.backends.django.DjangoTemplates',
+            'APP_DIRS': True,
+        }],
+        ROOT_URLCONF=__name__,
+    )
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def get_views():
+    """
+    Returns an ordered list of (`name`, view class, uses sessions) of the
+    wizards to load.
+    """
+    from django import forms
+    from django.http import HttpResponse
+
+    from multipleformwizard import views
+    from multipleformwizard.instances import MultipleInstancesMixin
+
+    class NameForm(forms.Form):
+        name = forms.CharField(max_length=20)
+
+    class StreetForm(forms.Form):
+        street = forms.CharField()
+
+    class CityForm(forms.Form):
+        city = forms.CharField()
+
+    class LoadWizardMixin(object):
+        form_list = [
+            ('start', NameForm),
+            ('address', (
+                ('street', StreetForm),
+                ('city', CityForm),
+            )),
+        ]
+
+        def done(self, form_list, form_dict, **kwargs):
+            return HttpResponse('done:%s' % form_dict['start'].cleaned_data['name'])
+
+    def wizard(base, name, *mixins):
+        attrs = {'url_name': '%s_step' % name} if issubclass(base, views.NamedUrlMultipleFormWizardView) else {}
+        return type(str('LoadWizard'), mixins + (LoadWizardMixin, base), attrs)
+
+    return [
+        ('session', wizard(views.SessionMultipleFormWizardView, 'session'), True),
+        ('cookie', wizard(views.CookieMultipleFormWizardView, 'cookie'), False),
+        ('hidden', wizard(views.HiddenFieldMultipleFormWizardView, 'hidden'), False),
+        ('named-session', wizard(views.NamedUrlSessionMultipleFormWizardView, 'named-session'), True),
+        ('named-cookie', wizard(views.NamedUrlCookieMultipleFormWizardView, 'named-cookie'), False),
+        ('instances', wizard(views.SessionMultipleFormWizardView, 'instances', MultipleInstancesMixin), True),
+    ]
+
+
+urlpatterns = []
+
+
+def build_urlpatterns(wizards):
+    from django.conf.urls import url
+
+    for name, view_class, uses_sessions in wizards:
+        view = view_class.as_view()
+        if 'url_name' in view_class.__dict__:
+            urlpatterns.append(url(r'^%s/(?P<step>.+)/$' % name, view, name='%s_step' % name))
+        urlpatterns.append(url(r'^%s/$' % name, view, name=name))
+
+
+class ThreadingWSGIServer(socketserver.ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+class QuietHandler(WSGIRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    from django.core.wsgi import get_wsgi_application
+
+    # The middleware is loaded per handler, switch it for every session engine
+    handler = {'application': None}
+
+    def application(environ, start_response):
+        return handler['application'](environ, start_response)
+
+    server = make_server('127.0.0.1', 0, application, server_class=ThreadingWSGIServer,
+                         handler_class=QuietHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    def set_application():
+        handler['application'] = get_wsgi_application()
+    return server, set_application
+
+
+class Tab(object):
+
+    def __init__(self, opener, url, name):
+        self.opener = opener
+        self.url = url
+        self.name = name
+        self.fields = {}
+        self.step = 0
+        self.finished = False
+
+    def request(self, stats, data=None):
+        start = time.time()
+        try:
+            response = self.opener.open(self.url, urlencode(data).encode('utf-8') if data is not None else None)
+            body = response.read().decode('utf-8')
+            self.url = response.geturl()
+        except (HTTPError, URLError, IOError):
+            stats['errors'] += 1
+            self.finished = True
+            return None
+        finally:
+            stats['latencies'].append(time.time() - start)
+        return body
+
+    def load(self, stats):
+        body = self.request(stats)
+        if body is not None:
+            self.fields = get_hidden_fields(body)
+
+    def submit(self, stats):
+        step, data = STEPS[self.step]
+        post_data = dict(self.fields)
+        post_data.update((key, value % {'name': self.name}) for key, value in data.items())
+        body = self.request(stats, post_data)
+        if body is None:
+            return
+
+        self.step += 1
+        if body.startswith('done:'):
+            self.finished = True
+            if self.step == len(STEPS) and body == 'done:%s' % self.name:
+                stats['completed'] += 1
+            else:
+                stats['conflicts'] += 1
+            return
+
+        self.fields = get_hidden_fields(body)
+        current_step = [value for key, value in self.fields.items() if key.endswith('-current_step')]
+        if self.step == len(STEPS) or current_step != [STEPS[self.step][0]]:
+            self.finished = True
+            stats['conflicts'] += 1
+
+
+def get_hidden_fields(body):
+    fields = {}
+    for tag in INPUT_RE.findall(body):
+        attributes = dict(ATTRIBUTE_RE.findall(tag))
+        if attributes.get('type') == 'hidden' and 'name' in attributes:
+            fields[unescape(attributes['name'])] = unescape(attributes.get('value', ''))
+    return fields
+
+
+def simulate_user(args):
+    """
+    Runs the wizard at `url` in `tabs` interleaved tabs sharing cookies.
+    Returns the stats of the user.
+    """
+    url, user, tabs = args
+    stats = {'latencies': [], 'completed': 0, 'conflicts': 0, 'errors': 0}
+    opener = build_opener(HTTPCookieProcessor(CookieJar()))
+    tabs = [Tab(opener, url, 'u%dt%d' % (user, tab)) for tab in range(tabs)]
+    for tab in tabs:
+        tab.load(stats)
+    while True:
+        active = [tab for tab in tabs if not tab.finished]
+        if not active:
+            break
+        for tab in active:
+            tab.submit(stats)
+    return stats
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run(url, args):
+    pool = (ThreadPool if args.pool == 'thread' else Pool)(args.workers)
+    try:
+        start = time.time()
+        results = pool.map(simulate_user, [(url, user, args.tabs) for user in range(args.users)], chunksize=1)
+        elapsed = time.time() - start
+    finally:
+        pool.close()
+        pool.join()
+
+    totals = {'latencies': [], 'completed': 0, 'conflicts': 0, 'errors': 0}
+    for stats in results:
+        for key, value in six.iteritems(stats):
+            totals[key] += value
+    latencies = sorted(totals['latencies'])
+    totals['requests'] = len(latencies)
+    totals['throughput'] = len(latencies) / elapsed
+    for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99)):
+        totals[name] = percentile(latencies, fraction) * 1000
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--tabs', type=int, default=2)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--pool', choices=('thread', 'process'), default='thread')
+    parser.add_argument('--views', default='session,cookie,hidden,named-session,named-cookie,instances')
+    parser.add_argument('--session-engines', default='db,cache')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        setup_django(os.path.join(directory, 'load.sqlite3'))
+        from django.test.utils import override_settings
+
+        wizards = [wizard for wizard in get_views() if wizard[0] in args.views.split(',')]
+        build_urlpatterns(wizards)
+        server, set_application = start_server()
+
+        print('%d users with %d tabs, %d %s workers' % (args.users, args.tabs, args.workers, args.pool))
+        print('%-14s %-10s %9s %9s %9s %9s %9s %9s %9s %7s' % (
+            'view', 'sessions', 'requests', 'req/s', 'p50 ms', 'p90 ms', 'p99 ms', 'completed', 'conflicts',
+            'errors'))
+        for name, view_class, uses_sessions in wizards:
+            engines = args.session_engines.split(',') if uses_sessions else ['-']
+            for engine in engines:
+                with override_settings(SESSION_ENGINE=SESSION_ENGINES.get(engine, SESSION_ENGINES['db'])):
+                    set_application()
+                    url = 'http://127.0.0.1:%d/%s/' % (server.server_port, name)
+                    totals = run(url, args)
+                print('%-14s %-10s %9d %9.1f %9.1f %9.1f %9.1f %9d %9d %7d' % (
+                    name, engine, totals['requests'], totals['throughput'], totals['p50'], totals['p90'],
+                    totals['p99'], totals['completed'], totals['conflicts'], totals['errors']))
+        server.shutdown()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""
+Measures the cost of recording a counter increment and a histogram
+observation in a `MetricsRegistry`, per event, from one or more threads. The
+best of `--runs` runs is reported, minus the cost of the loop itself.
+
+    python benchmarks/metrics.py [--events 100000] [--threads 1] [--runs 50]
+"""
+from __future__ import print_function
+import argparse
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from multipleformwizard.metrics import MetricsRegistry  # noqa
+
+LABELS = ('benchmarks.Wizard', 'start')
+
+
+def record_inc(metrics, events):
+    inc = metrics.inc
+    for i in range(events):
+        inc('multipleformwizard_step_renders_total', LABELS)
+
+
+def record_observe(metrics, events):
+    observe = metrics.observe
+    for i in range(events):
+        observe('multipleformwizard_step_duration_seconds', LABELS, 0.03)
+
+
+def record_nothing(metrics, events):
+    for i in range(events):
+        pass
+
+
+def measure(record, events, threads, runs):
+    timings = []
+    for run in range(runs):
+        metrics = MetricsRegistry()
+        workers = [threading.Thread(target=record, args=(metrics, events)) for i in range(threads)]
+        start = time.time()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        timings.append(time.time() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=100000)
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--runs', type=int, default=50)
+    args = parser.parse_args()
+
+    total = args.events * args.threads
+    loop = measure(record_nothing, args.events, args.threads, args.runs)
+    for name, record in (('inc', record_inc), ('observe', record_observe)):
+        elapsed = measure(record, args.events, args.threads, args.runs) - loop
+        print('%-8s %d threads: %8.1f ns per event' % (name, args.threads, elapsed / total * 1e9))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""
+Measures the time it takes to render a wizard step with many forms through
+the Django template language and through Jinja2 (if installed). The step has
+a form and a formset with `--forms` forms of 10 fields each.
+
+    python benchmarks/render.py [--forms 200] [--runs 20]
+"""
+from __future__ import print_function
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import django  # noqa
+from django.conf import settings  # noqa
+
+TEMPLATES = [{
+    'BACKEND': 'django.template.backends.django.DjangoTemplates',
+    'NAME': 'django',
+    'APP_DIRS': False,
+    'OPTIONS': {
+        # Compile the templates once, like in production
+        'loaders': [
+            ('django.template.loaders.cached.Loader', ['django.template.loaders.app_directories.Loader']),
+        ],
+    },
+}]
+try:
+    import jinja2  # noqa
+except ImportError:
+    jinja2 = None
+else:
+    TEMPLATES.append({
+        'BACKEND': 'django.template.backends.jinja2.Jinja2',
+        'NAME': 'jinja2',
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'environment': 'multipleformwizard.jinja2env.environment',
+        },
+    })
+
+settings.configure(
+    SECRET_KEY='multipleformwizard-benchmarks',
+    INSTALLED_APPS=['multipleformwizard'],
+    TEMPLATES=TEMPLATES,
+)
+django.setup()
+
+from django import forms  # noqa
+from django.forms.formsets import formset_factory  # noqa
+from django.test import RequestFactory  # noqa
+
+from multipleformwizard.views import CookieMultipleFormWizardView  # noqa
+
+
+class DetailsForm(forms.Form):
+    name = forms.CharField(max_length=100)
+    email = forms.EmailField()
+
+
+class ItemForm(forms.Form):
+    title = forms.CharField(max_length=100)
+    description = forms.CharField(widget=forms.Textarea, required=False)
+    quantity = forms.IntegerField(min_value=0)
+    price = forms.DecimalField(max_digits=10, decimal_places=2)
+    unit = forms.ChoiceField(choices=[('piece', 'Piece'), ('kg', 'Kilogram'), ('l', 'Liter')])
+    delivery = forms.DateField(required=False)
+    express = forms.BooleanField(required=False)
+    reference = forms.CharField(max_length=20, required=False)
+    notes = forms.CharField(required=False)
+    url = forms.URLField(required=False)
+
+
+class BenchmarkWizard(CookieMultipleFormWizardView):
+    pass
+
+
+def measure(engine, extra_forms, runs):
+    ItemFormSet = formset_factory(ItemForm, extra=extra_forms)
+    view = BenchmarkWizard.as_view(form_list=[('order', (('details', DetailsForm), ('items', ItemFormSet)))],
+                                   template_engine=engine)
+    request = RequestFactory().get('/')
+    view(request).render()
+
+    timings = []
+    for i in range(runs):
+        response = view(request)
+        start = time.time()
+        response.render()
+        timings.append(time.time() - start)
+    timings.sort()
+    return timings[len(timings) // 2], timings[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--forms', type=int, default=200)
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    engines = ['django']
+    if jinja2 is None:
+        print('Jinja2 is not installed, only measuring the Django template language.')
+    else:
+        engines.append('jinja2')
+    for engine in engines:
+        median, best = measure(engine, args.forms, args.runs)
+        print('%-7s %4d forms: median %8.2f ms, best %8.2f ms' % (engine, args.forms, median * 1000, best * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,33 @@
+import sys
+
 __version__ = '0.2.16'
 
-try:
-    # This is in a try-except block to prevent import errors at install time
-    from .views import (SessionMultipleFormWizardView, CookieMultipleFormWizardView,
-                        NamedUrlSessionMultipleFormWizardView, NamedUrlCookieMultipleFormWizardView,
-                        MultipleFormWizardView, NamedUrlMultipleFormWizardView)
-except ImportError:
-    pass
+default_app_config = 'multipleformwizard.apps.MultipleFormWizardConfig'
+
+__all__ = [
+    'MultipleFormWizardView', 'SessionMultipleFormWizardView', 'CookieMultipleFormWizardView',
+    'HiddenFieldMultipleFormWizardView', 'NamedUrlMultipleFormWizardView',
+    'NamedUrlSessionMultipleFormWizardView', 'NamedUrlCookieMultipleFormWizardView',
+]
+
+if sys.version_info >= (3, 7):
+    # The views are imported on first access, so importing the package (e.g.
+    # at install time or while loading settings) doesn't import Django forms
+    # and formtools.
+    def __getattr__(name):
+        if name in __all__:
+            from . import views
+            return getattr(views, name)
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+    def __dir__():
+        return sorted(list(globals()) + __all__)
+else:
+    try:
+        # This is in a try-except block to prevent import errors at install time
+        from .views import (SessionMultipleFormWizardView, CookieMultipleFormWizardView,
+                            HiddenFieldMultipleFormWizardView,
+                            NamedUrlSessionMultipleFormWizardView, NamedUrlCookieMultipleFormWizardView,
+                            MultipleFormWizardView, NamedUrlMultipleFormWizardView)
+    except ImportError:
+        pass
@@ -0,0 +1,19 @@
+from __future__ import unicode_literals
+from django.apps import AppConfig
+from django.conf import settings
+from django.core.checks import register
+
+
+class MultipleFormWizardConfig(AppConfig):
+    name = 'multipleformwizard'
+    verbose_name = 'Multiple form wizard'
+
+    def ready(self):
+        # The checks module doesn't import the views (and formtools) until the
+        # checks run
+        from . import checks
+
+        register('multipleformwizard')(checks.check_wizards)
+
+        if getattr(settings, 'MULTIPLEFORMWIZARD_WARM_UP', False):
+            checks.warm_up()
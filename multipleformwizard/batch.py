@@ -0,0 +1,225 @@
+from __future__ import unicode_literals
+import multiprocessing
+from collections import OrderedDict
+
+import six
+from django.core.files.base import File
+from django.forms import formsets
+
+from formtools.wizard.storage.base import BaseStorage
+from formtools.wizard.views import StepsHelper
+
+
+class MemoryStorage(BaseStorage):
+    """
+    A storage backend that keeps the wizard data in memory, without a request.
+    Files are kept as the given file objects instead of being copied into a
+    `file_storage`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(MemoryStorage, self).__init__(*args, **kwargs)
+        self.init_data()
+
+    def get_step_files(self, step):
+        return self.data[self.step_files_key].get(step, None) or None
+
+    def set_step_files(self, step, files):
+        self.data[self.step_files_key][step] = dict(files or {})
+
+
+class BatchResult(object):
+    """
+    The outcome of validating a single record.
+
+    * `index` - the position of the record in the iterable of records.
+    * `cleaned_data` - an ordered dictionary of step name -> cleaned_data, or
+      step name -> {`tag`: cleaned_data} for steps with multiple forms.
+    * `errors` - an ordered dictionary of step name -> errors, structured like
+      `cleaned_data`. A value of None means the record contains no data for a
+      step that is part of the form list.
+    """
+
+    def __init__(self, index, cleaned_data, errors):
+        self.index = index
+        self.cleaned_data = cleaned_data
+        self.errors = errors
+
+    def __repr__(self):
+        return '<BatchResult %s: %s>' % (self.index, 'valid' if self.is_valid else 'invalid')
+
+    @property
+    def is_valid(self):
+        return not self.errors
+
+
+class BatchValidator(object):
+    """
+    Validates complete wizard submissions without requests or a storage
+    backend, using the step construction, `condition_dict` evaluation and
+    revalidation logic of the wizard view's `render_done`.
+
+    A record is a dictionary of step name -> payload. For steps with multiple
+    forms, the payload is a dictionary of `tag` -> payload. A form payload is a
+    dictionary of (unprefixed) field name -> value, a formset payload is a list
+    of those. File objects are passed as files to the form.
+
+    Unlike `render_done`, validation does not stop at the first invalid step:
+    the errors of every step are collected.
+    """
+
+    def __init__(self, wizard_class, **initkwargs):
+        self.wizard_class = wizard_class
+        self._initkwargs = initkwargs
+        self.initkwargs = wizard_class.get_initkwargs(**initkwargs)
+
+    def get_wizard(self):
+        """
+        Returns a wizard view instance set up with an empty `MemoryStorage`.
+        The instance has no request, condition callables should not rely on one.
+        """
+        wizard = self.wizard_class(**self.initkwargs)
+        wizard.request = None
+        wizard.args = ()
+        wizard.kwargs = {}
+        wizard.prefix = wizard.get_prefix(None)
+        wizard.storage = MemoryStorage(wizard.prefix)
+        wizard.steps = StepsHelper(wizard)
+        wizard.ensure_form_list()
+        return wizard
+
+    def get_step_payload(self, wizard, step, payload):
+        """
+        Converts the payload for `step` to the prefixed data and files the
+        forms of that step would receive from a POST request.
+        """
+        data, files = {}, {}
+        form_struct = wizard.form_list[step]
+        if isinstance(form_struct, dict):
+            for form_name, form_class in form_struct.items():
+                if form_name in payload:
+                    self._add_payload(data, files, wizard.get_form_prefix(step, form_name),
+                                      payload[form_name])
+        else:
+            self._add_payload(data, files, wizard.get_form_prefix(step, form_struct), payload)
+        return data, files
+
+    def _add_payload(self, data, files, prefix, payload):
+        if isinstance(payload, (list, tuple)):
+            # A formset, add the management form data too
+            data.update({
+                '%s-%s' % (prefix, formsets.TOTAL_FORM_COUNT): [six.text_type(len(payload))],
+                '%s-%s' % (prefix, formsets.INITIAL_FORM_COUNT): ['0'],
+                '%s-%s' % (prefix, formsets.MIN_NUM_FORM_COUNT): ['0'],
+                '%s-%s' % (prefix, formsets.MAX_NUM_FORM_COUNT): [six.text_type(formsets.DEFAULT_MAX_NUM)],
+            })
+            for i, form_payload in enumerate(payload):
+                self._add_payload(data, files, '%s-%s' % (prefix, i), form_payload)
+            return
+
+        for field_name, value in six.iteritems(payload):
+            key = '%s-%s' % (prefix, field_name) if prefix else field_name
+            if isinstance(value, File):
+                files[key] = value
+            elif isinstance(value, (list, tuple)):
+                data[key] = list(value)
+            else:
+                data[key] = [value]
+
+    def validate(self, record, index=None):
+        """
+        Validates a single record and returns a `BatchResult`.
+        """
+        wizard = self.get_wizard()
+        for step in wizard.form_list:
+            payload = record.get(step, None)
+            if payload is None:
+                continue
+            data, files = self.get_step_payload(wizard, step, payload)
+            wizard.storage.set_step_data(step, data)
+            wizard.storage.set_step_files(step, files)
+
+        cleaned_data = OrderedDict()
+        errors = OrderedDict()
+        multiple_steps = [step for step, form_struct in six.iteritems(wizard.form_list)
+                          if isinstance(form_struct, dict)]
+        for step in wizard.get_form_list():
+            form_objs = wizard.get_stored_forms(step)
+            if not all(form_obj.is_bound for form_obj in form_objs):
+                errors[step] = None
+            elif step in multiple_steps:
+                if all([form_obj.is_valid() for form_obj in form_objs]):
+                    cleaned_data[step] = OrderedDict(
+                        (form_obj._tag, form_obj.cleaned_data) for form_obj in form_objs)
+                else:
+                    errors[step] = OrderedDict(
+                        (form_obj._tag, _error_data(form_obj)) for form_obj in form_objs
+                        if not form_obj.is_valid())
+            else:
+                form_obj = form_objs[0]
+                if form_obj.is_valid():
+                    cleaned_data[step] = form_obj.cleaned_data
+                else:
+                    errors[step] = _error_data(form_obj)
+        return BatchResult(index, cleaned_data, errors)
+
+    def validate_many(self, records, processes=None, chunksize=1):
+        """
+        Validates an iterable of records and yields a `BatchResult` for each of
+        them, in order.
+
+        If `processes` is given, the records are spread across a pool of that
+        many worker processes. The validator, records and results are pickled
+        to and from the workers, so they may not contain unpicklable values,
+        like open files or lambdas.
+        """
+        if not processes or processes == 1:
+            for index, record in enumerate(records):
+                yield self.validate(record, index)
+            return
+
+        pool = multiprocessing.Pool(processes, initializer=_init_worker, initargs=(self,))
+        try:
+            for result in pool.imap(_validate_in_worker, enumerate(records), chunksize):
+                yield result
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def __getstate__(self):
+        # The workers compute the initkwargs again
+        return {'wizard_class': self.wizard_class, 'initkwargs': self._initkwargs}
+
+    def __setstate__(self, state):
+        self.__init__(state['wizard_class'], **state['initkwargs'])
+
+
+def validate_records(wizard_class, records, processes=None, chunksize=1, **initkwargs):
+    """
+    Shortcut for `BatchValidator(wizard_class, **initkwargs).validate_many(...)`.
+    """
+    validator = BatchValidator(wizard_class, **initkwargs)
+    return validator.validate_many(records, processes=processes, chunksize=chunksize)
+
+
+def _error_data(form):
+    if isinstance(form, formsets.BaseFormSet):
+        return {
+            'forms': [_error_data(form_obj) for form_obj in form.forms],
+            'non_form_errors': [six.text_type(e) for e in form.non_form_errors()],
+        }
+    return dict((field, [six.text_type(e) for e in errors])
+                for field, errors in six.iteritems(form.errors))
+
+
+_worker_validator = None
+
+
+def _init_worker(validator):
+    global _worker_validator
+    _worker_validator = validator
+
+
+def _validate_in_worker(item):
+    index, record = item
+    return _worker_validator.validate(record, index)
@@ -0,0 +1,130 @@
+from __future__ import unicode_literals
+import six
+from django.core import checks
+from django.core.urlresolvers import get_resolver
+
+# The view kwargs which are dictionaries per step name
+STEP_DICTS = ('initial_dict', 'instance_dict', 'condition_dict')
+
+
+def warm_up():
+    """
+    Imports the URLconf, which computes the form lists of the wizards it
+    routes to, and populates the URL resolver, so the first request doesn't
+    have to.
+    """
+    resolver = get_resolver(None)
+    resolver.url_patterns
+    resolver.reverse_dict
+
+
+def get_url_wizards(patterns=None):
+    """
+    Yields the (`view_class`, `initkwargs`) of the wizard views in the
+    URLconf.
+    """
+    from .views import MultipleFormWizardView
+
+    if patterns is None:
+        patterns = get_resolver(None).url_patterns
+    for pattern in patterns:
+        if hasattr(pattern, 'url_patterns'):
+            for wizard in get_url_wizards(pattern.url_patterns):
+                yield wizard
+            continue
+        view_class = getattr(pattern.callback, 'view_class', None)
+        if view_class is not None and issubclass(view_class, MultipleFormWizardView):
+            yield view_class, pattern.callback.view_initkwargs
+
+
+def get_wizard_subclasses(cls=None):
+    """
+    Yields the (indirect) subclasses of `cls` (`MultipleFormWizardView` by
+    default) with a `form_list`.
+    """
+    if cls is None:
+        from .views import MultipleFormWizardView as cls
+
+    seen = set()
+    classes = list(cls.__subclasses__())
+    while classes:
+        subclass = classes.pop(0)
+        if subclass in seen:
+            continue
+        seen.add(subclass)
+        classes.extend(subclass.__subclasses__())
+        if subclass.form_list:
+            yield subclass
+
+
+def check_wizards(app_configs=None, **kwargs):
+    """
+    Checks the form lists and step dictionaries of the wizard views in the
+    URLconf, and of the other wizard classes with a `form_list`. Registered by
+    the app config.
+    """
+    from formtools.wizard.storage.exceptions import NoFileStorageConfigured
+
+    errors = []
+    checked = set()
+    try:
+        url_wizards = list(get_url_wizards())
+    except (AssertionError, NoFileStorageConfigured) as e:
+        # A wizard view failed to compute its form list in the URLconf
+        url_wizards = []
+        errors.extend(_check_error(e, None))
+
+    for view_class, initkwargs in url_wizards:
+        checked.add(view_class)
+        errors.extend(check_step_plan(view_class, initkwargs))
+
+    for view_class in get_wizard_subclasses():
+        if view_class in checked:
+            continue
+        try:
+            initkwargs = view_class.get_initkwargs()
+        except (AssertionError, NoFileStorageConfigured) as e:
+            errors.extend(_check_error(e, view_class))
+            continue
+        errors.extend(check_step_plan(view_class, initkwargs))
+    return errors
+
+
+def check_step_plan(view_class, initkwargs):
+    """
+    Checks that the step dictionaries in `initkwargs` refer to steps in the
+    computed form list.
+    """
+    if initkwargs.get('_form_list_factory') is not None:
+        # The form list is computed per request
+        return []
+
+    errors = []
+    form_list = initkwargs['form_list']
+    for name in STEP_DICTS:
+        for step in initkwargs.get(name) or {}:
+            if six.text_type(step) not in form_list:
+                errors.append(checks.Warning(
+                    '%s refers to the unknown step "%s".' % (name, step),
+                    hint='The steps are: %s.' % ', '.join(form_list),
+                    obj=view_class,
+                    id='multipleformwizard.W001',
+                ))
+    return errors
+
+
+def _check_error(exception, view_class):
+    from formtools.wizard.storage.exceptions import NoFileStorageConfigured
+
+    if isinstance(exception, NoFileStorageConfigured):
+        return [checks.Error(
+            six.text_type(exception),
+            hint='Set file_storage on the wizard view, a form of its form list has a FileField.',
+            obj=view_class,
+            id='multipleformwizard.E001',
+        )]
+    return [checks.Error(
+        'Invalid wizard definition: %s' % exception,
+        obj=view_class,
+        id='multipleformwizard.E002',
+    )]
@@ -0,0 +1,171 @@
+from __future__ import unicode_literals
+import re
+import uuid
+
+from django import forms
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.http import urlencode
+from formtools.wizard.forms import ManagementForm
+from formtools.wizard.storage import get_storage
+
+from .views import NamedUrlMultipleFormWizardView
+
+INSTANCE_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+
+class InstanceManagementForm(ManagementForm):
+    """
+    The management form of wizards with multiple instances, which also carries
+    the id of the instance and the version of its state the step was rendered
+    with.
+    """
+    instance_id = forms.RegexField(INSTANCE_ID_RE, widget=forms.HiddenInput)
+    version = forms.IntegerField(widget=forms.HiddenInput)
+
+
+class MultipleInstancesMixin(object):
+    """
+    A mixin for wizard views which allows a user to fill in the same wizard
+    several times at once, for example in two browser tabs.
+
+    Every GET request to the wizard (to a step of a NamedUrl wizard, without
+    instance id) which renders a step starts a new instance with its own
+    storage namespace. Its id is carried in the management form (and in the step URLs of NamedUrl
+    wizards). The state of every instance has a version, incremented by every
+    submission; submissions of a step rendered with an older version (from a
+    tab with an outdated page) are not processed, the current state of the
+    instance is rendered instead, with ``wizard.conflict`` set.
+
+    At most `instance_limit` instances are kept per session and wizard: the
+    state of the least recently used instances is deleted. The mixin requires
+    the session middleware, also with cookie storage.
+
+    Example:
+
+    .. code-block:: python
+
+        class MyWizard(MultipleInstancesMixin, SessionMultipleFormWizardView):
+            form_list = [...]
+            instance_limit = 5
+    """
+    instance_limit = 10
+    version_key = 'instance_version'
+    conflict_key = 'instance_conflict'
+    instance_conflict = False
+    instance_rendered = False
+
+    @property
+    def instance_field_name(self):
+        return '%s-instance_id' % self.prefix
+
+    def get_instance_id(self, request):
+        """
+        Returns the id of the requested wizard instance, or None.
+        """
+        data = request.POST if request.method == 'POST' else request.GET
+        instance_id = data.get(self.instance_field_name, '')
+        if INSTANCE_ID_RE.match(instance_id):
+            return instance_id
+        return None
+
+    def get_instance_storage_prefix(self, instance_id):
+        return '%s_%s' % (self.prefix, instance_id)
+
+    def get_storage_prefix(self, request, *args, **kwargs):
+        self.instance_id = self.get_instance_id(request)
+        self.instance_created = self.instance_id is None
+        if self.instance_created:
+            self.instance_id = uuid.uuid4().hex
+        return self.get_instance_storage_prefix(self.instance_id)
+
+    def get_instance_version(self):
+        return self.storage.data.get(self.version_key, 0)
+
+    def dispatch(self, request, *args, **kwargs):
+        if not hasattr(request, 'session'):
+            raise ImproperlyConfigured(
+                '%s keeps its instances per session, it requires the session middleware.'
+                % self.__class__.__name__)
+        response = super(MultipleInstancesMixin, self).dispatch(request, *args, **kwargs)
+        if self.instance_rendered or not self.instance_created:
+            self.register_instance(response)
+        else:
+            # No step of the new instance was rendered (e.g. a schema request
+            # or a redirect), don't keep its state.
+            self.evict_instance(self.instance_id, response)
+        return response
+
+    def register_instance(self, response):
+        """
+        Marks the instance as the most recently used one of the session and
+        evicts the instances beyond `instance_limit`.
+        """
+        registry_key = 'wizard_%s_instances' % self.prefix
+        instances = [
+            instance_id for instance_id in self.request.session.get(registry_key, [])
+            if instance_id != self.instance_id]
+        instances.append(self.instance_id)
+        while len(instances) > self.instance_limit:
+            self.evict_instance(instances.pop(0), response)
+        self.request.session[registry_key] = instances
+
+    def evict_instance(self, instance_id, response):
+        """
+        Deletes the state (and uploaded files) of a wizard instance.
+        """
+        storage = get_storage(self.storage_name, self.get_instance_storage_prefix(instance_id),
+                              self.request, getattr(self, 'file_storage', None))
+        storage.reset()
+        storage.update_response(response)
+        self.request.session.pop(storage.prefix, None)
+        if storage.prefix in self.request.COOKIES or storage.prefix in response.cookies:
+            response.delete_cookie(storage.prefix)
+
+    def render(self, forms=None, **kwargs):
+        self.instance_rendered = True
+        if self.storage.data.pop(self.conflict_key, False):
+            self.instance_conflict = True
+        return super(MultipleInstancesMixin, self).render(forms, **kwargs)
+
+    def get_management_form(self, data=None):
+        return InstanceManagementForm(data, prefix=self.prefix, initial={
+            'current_step': self.steps.current,
+            'instance_id': self.instance_id,
+            'version': self.get_instance_version(),
+        })
+
+    def post(self, *args, **kwargs):
+        version = self.get_instance_version()
+        try:
+            posted_version = int(self.request.POST.get('%s-version' % self.prefix))
+        except (TypeError, ValueError):
+            posted_version = None
+        if posted_version != version:
+            return self.render_conflict()
+
+        self.storage.data[self.version_key] = version + 1
+        return super(MultipleInstancesMixin, self).post(*args, **kwargs)
+
+    def render_conflict(self):
+        """
+        Renders the current step of the instance, for a submission of an
+        outdated version of its state.
+        """
+        self.ensure_form_list()
+        if isinstance(self, NamedUrlMultipleFormWizardView):
+            # The step is rendered after a redirect, keep the flag until then
+            self.storage.data[self.conflict_key] = True
+            return self.render_goto_step(self.steps.current)
+        self.instance_conflict = True
+        return self.render(self.get_stored_forms(self.steps.current))
+
+    def get_context_data(self, forms, **kwargs):
+        context = super(MultipleInstancesMixin, self).get_context_data(forms=forms, **kwargs)
+        context['wizard']['instance_id'] = self.instance_id
+        context['wizard']['conflict'] = self.instance_conflict
+        return context
+
+    def get_step_url(self, step):
+        # Only used by NamedUrl wizards
+        step_url = super(MultipleInstancesMixin, self).get_step_url(step)
+        return '%s?%s' % (step_url, urlencode({self.instance_field_name: self.instance_id}))
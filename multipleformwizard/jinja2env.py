@@ -0,0 +1,21 @@
+from __future__ import unicode_literals
+from django.utils import translation
+from jinja2 import Environment
+
+
+def environment(**options):
+    """
+    A Jinja2 environment for the wizard templates, with Django's translations
+    installed for the ``i18n`` extension. Use it as the ``environment`` option
+    of a ``django.template.backends.jinja2.Jinja2`` backend.
+
+    The environment compiles every template once and keeps it in its cache
+    (`cache_size` templates), unless `auto_reload` is set, which the backend
+    enables in ``DEBUG`` mode.
+    """
+    extensions = list(options.pop('extensions', []))
+    if 'jinja2.ext.i18n' not in extensions:
+        extensions.append('jinja2.ext.i18n')
+    env = Environment(extensions=extensions, **options)
+    env.install_gettext_translations(translation, newstyle=True)
+    return env
@@ -0,0 +1,34 @@
+from __future__ import unicode_literals
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from multipleformwizard.storage.files import ContentHashFileStorage
+
+
+class Command(BaseCommand):
+    args = '<storage_path storage_path ...>'
+    help = ('Deletes abandoned wizard uploads and unreferenced content from a ContentHashFileStorage. '
+            'A storage path is the dotted path to the storage, or to a wizard view with a file_storage.')
+    option_list = BaseCommand.option_list + (
+        make_option('--max-age', type='int', dest='max_age', default=24,
+                    help='Delete uploads older than this number of hours (default: 24).'),
+    )
+
+    def handle(self, *storage_paths, **options):
+        if not storage_paths:
+            raise CommandError('Enter at least one storage path.')
+
+        for storage_path in storage_paths:
+            try:
+                storage = import_string(storage_path)
+            except ImportError as e:
+                raise CommandError('Cannot import %s: %s' % (storage_path, e))
+            storage = getattr(storage, 'file_storage', storage)
+            if not isinstance(storage, ContentHashFileStorage):
+                raise CommandError('%s is not a ContentHashFileStorage.' % storage_path)
+
+            deleted_names, deleted_blobs = storage.purge(max_age=options['max_age'] * 3600)
+            self.stdout.write('%s: deleted %d uploads and %d unreferenced files.' % (
+                storage_path, deleted_names, deleted_blobs))
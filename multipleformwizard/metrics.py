@@ -0,0 +1,233 @@
+from __future__ import unicode_literals
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+import six
+from django.http import HttpResponse
+
+# Upper bounds (in seconds) of the step duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS = (
+    ('multipleformwizard_step_renders_total', 'counter', ('wizard', 'step'),
+     'Number of times a wizard step was rendered.'),
+    ('multipleformwizard_step_submissions_total', 'counter', ('wizard', 'step', 'result'),
+     'Number of submitted wizard steps, per validation result.'),
+    ('multipleformwizard_form_validations_total', 'counter', ('wizard', 'step', 'tag', 'result'),
+     'Number of validated forms of submitted wizard steps, per form tag and validation result.'),
+    ('multipleformwizard_revalidation_failures_total', 'counter', ('wizard', 'step'),
+     'Number of wizard steps that failed to revalidate on the last step.'),
+    ('multipleformwizard_done_total', 'counter', ('wizard',),
+     'Number of completed wizards.'),
+    ('multipleformwizard_step_duration_seconds', 'histogram', ('wizard', 'step'),
+     'Time spent processing wizard step submissions.'),
+)
+
+
+class _Shard(threading.local):
+    """
+    The counters and histograms of the current thread. A thread gets its shard
+    when it first accesses it, without checks on every update.
+    """
+
+    def __init__(self, registry):
+        self.counters = defaultdict(int)
+        self.histograms = defaultdict(registry._new_histogram)
+        registry._add_shard(self.counters, self.histograms)
+
+
+class MetricsRegistry(object):
+    """
+    Counters and histograms for wizard views. Every thread updates its own
+    dictionaries without locking; they are only merged when exported. The
+    dictionaries of finished threads are merged into a retired total.
+    """
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._shards = []
+        self._retired = ({}, {})
+        self._local = _Shard(self)
+
+    def _add_shard(self, counters, histograms):
+        with self._lock:
+            self._retire_shards()
+            self._shards.append((threading.current_thread(), counters, histograms))
+
+    def _retire_shards(self):
+        # Called with the lock held. Finished threads no longer update their
+        # dictionaries.
+        shards = []
+        for shard in self._shards:
+            if shard[0].is_alive():
+                shards.append(shard)
+            else:
+                _merge(self._retired, shard[1:])
+        self._shards = shards
+
+    def _new_histogram(self):
+        # The bucket counts (the last one is +Inf), followed by the sum
+        return [0] * (len(self.buckets) + 1) + [0.0]
+
+    def inc(self, name, labels):
+        self._local.counters[name, labels] += 1
+
+    def observe(self, name, labels, value):
+        histogram = self._local.histograms[name, labels]
+        histogram[bisect_left(self.buckets, value)] += 1
+        histogram[-1] += value
+
+    def collect(self):
+        """
+        Returns the merged counters and histograms of all threads, as
+        dictionaries of (name, labels) -> value.
+        """
+        totals = ({}, {})
+        with self._lock:
+            self._retire_shards()
+            _merge(totals, self._retired)
+            shards = list(self._shards)
+        for thread, counters, histograms in shards:
+            _merge(totals, (counters, histograms))
+        return totals
+
+    def reset(self):
+        with self._lock:
+            for thread, counters, histograms in self._shards:
+                counters.clear()
+                histograms.clear()
+            for retired in self._retired:
+                retired.clear()
+
+    def export(self):
+        """
+        Returns the metrics in the Prometheus text exposition format.
+        """
+        counters, histograms = self.collect()
+        lines = []
+        for name, metric_type, label_names, help_text in METRICS:
+            lines.append('# HELP %s %s' % (name, help_text))
+            lines.append('# TYPE %s %s' % (name, metric_type))
+            if metric_type == 'counter':
+                for (metric_name, labels), value in sorted(six.iteritems(counters)):
+                    if metric_name == name:
+                        lines.append('%s%s %s' % (name, _format_labels(label_names, labels), value))
+                continue
+
+            for (metric_name, labels), histogram in sorted(six.iteritems(histograms)):
+                if metric_name != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(self.buckets + (None,), histogram[:-1]):
+                    cumulative += count
+                    le = '+Inf' if bound is None else repr(bound)
+                    lines.append('%s_bucket%s %d' % (
+                        name, _format_labels(label_names + ('le',), labels + (le,)), cumulative))
+                lines.append('%s_sum%s %r' % (name, _format_labels(label_names, labels), histogram[-1]))
+                lines.append('%s_count%s %d' % (name, _format_labels(label_names, labels), cumulative))
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class FunnelMetricsMixin(object):
+    """
+    A mixin for wizard views which records per wizard class and step how
+    often steps are rendered, submitted and fail to (re)validate, how long the
+    submissions take to process, and how often the wizard is completed.
+
+    The wizard is labelled with `metrics_name`, the module and qualified name
+    of its class by default.
+
+    Example:
+
+    .. code-block:: python
+
+        class MyWizard(FunnelMetricsMixin, SessionMultipleFormWizardView):
+            form_list = [...]
+    """
+    metrics = registry
+    metrics_name = None
+
+    def get_metrics_name(self):
+        if self.metrics_name is not None:
+            return self.metrics_name
+        cls = self.__class__
+        return '%s.%s' % (cls.__module__, getattr(cls, '__qualname__', cls.__name__))
+
+    def post(self, *args, **kwargs):
+        self._metrics_step = None
+        start = time.time()
+        try:
+            return super(FunnelMetricsMixin, self).post(*args, **kwargs)
+        finally:
+            if self._metrics_step is not None:
+                self.metrics.observe('multipleformwizard_step_duration_seconds',
+                                     (self.get_metrics_name(), self._metrics_step), time.time() - start)
+
+    def validate_forms(self, forms):
+        all_valid = super(FunnelMetricsMixin, self).validate_forms(forms)
+        wizard, step = self.get_metrics_name(), self.steps.current
+        self._metrics_step = step
+        for form in forms:
+            self.metrics.inc('multipleformwizard_form_validations_total', (
+                wizard, step, getattr(form, '_tag', ''), 'valid' if form.is_valid() else 'invalid'))
+        self.metrics.inc('multipleformwizard_step_submissions_total', (
+            wizard, step, 'valid' if all_valid else 'invalid'))
+        return all_valid
+
+    def render(self, forms=None, **kwargs):
+        self.metrics.inc('multipleformwizard_step_renders_total', (self.get_metrics_name(), self.steps.current))
+        return super(FunnelMetricsMixin, self).render(forms, **kwargs)
+
+    def render_revalidation_failure(self, failed_step, form, **kwargs):
+        self._metrics_revalidation_failed = True
+        self.metrics.inc('multipleformwizard_revalidation_failures_total', (self.get_metrics_name(), failed_step))
+        return super(FunnelMetricsMixin, self).render_revalidation_failure(failed_step, form, **kwargs)
+
+    def render_done(self, form, **kwargs):
+        self._metrics_revalidation_failed = False
+        response = super(FunnelMetricsMixin, self).render_done(form, **kwargs)
+        # NamedUrl wizards only call done on the done step
+        done_step_name = getattr(self, 'done_step_name', None)
+        if not self._metrics_revalidation_failed and kwargs.get('step', done_step_name) == done_step_name:
+            self.metrics.inc('multipleformwizard_done_total', (self.get_metrics_name(),))
+        return response
+
+
+def metrics_view(request):
+    """
+    Exports the metrics of this process in the Prometheus text format.
+    """
+    return HttpResponse(registry.export(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def _merge(totals, shard):
+    counters, histograms = totals
+    shard_counters, shard_histograms = shard
+    for key, value in _items(shard_counters):
+        counters[key] = counters.get(key, 0) + value
+    for key, histogram in _items(shard_histograms):
+        if key in histograms:
+            histograms[key] = [a + b for a, b in zip(histograms[key], histogram)]
+        else:
+            histograms[key] = list(histogram)
+
+
+def _items(dictionary):
+    # Other threads can add keys while we copy
+    while True:
+        try:
+            return list(dictionary.items())
+        except RuntimeError:
+            pass
+
+
+def _format_labels(label_names, labels):
+    return '{%s}' % ','.join('%s="%s"' % (
+        name, six.text_type(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in zip(label_names, labels))
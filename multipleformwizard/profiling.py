@@ -0,0 +1,181 @@
+from __future__ import unicode_literals
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+try:
+    import tracemalloc
+except ImportError:  # Python < 3.4
+    tracemalloc = None
+
+logger = logging.getLogger('multipleformwizard.profiling')
+
+# The wizard view methods measured separately. `done` is usually overridden
+# by the wizard itself, it is measured as part of `render_done`.
+PROFILED_PHASES = ('get', 'post', 'get_forms', 'render', 'get_all_cleaned_data_dict', 'render_done')
+
+# Tracing is process-wide, it is started by the first profiled request and
+# stopped by the last one (unless it was already started by someone else).
+_tracing_lock = threading.Lock()
+_tracing = {'requests': 0, 'started': False}
+
+
+def _start_tracing():
+    with _tracing_lock:
+        if _tracing['requests'] == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing['started'] = True
+        _tracing['requests'] += 1
+
+
+def _stop_tracing():
+    with _tracing_lock:
+        _tracing['requests'] -= 1
+        if _tracing['requests'] == 0 and _tracing['started']:
+            tracemalloc.stop()
+            _tracing['started'] = False
+
+
+class PhaseMemory(object):
+    """
+    The memory allocated by a phase for a step, in bytes, over all its calls
+    during a request. `peak` is the highest traced memory during a call
+    (relative to the start of that call), `retained` the sum of the traced
+    memory still allocated at the end of the calls.
+    """
+
+    def __init__(self, phase, step):
+        self.phase = phase
+        self.step = step
+        self.calls = 0
+        self.peak = 0
+        self.retained = 0
+
+    def __repr__(self):
+        return '<PhaseMemory %s %s: %d calls, peak %d, retained %d>' % (
+            self.phase, self.step, self.calls, self.peak, self.retained)
+
+
+def _profiled(name):
+    def method(self, *args, **kwargs):
+        parent = getattr(super(MemoryProfilingMixin, self), name)
+        if getattr(self, 'memory_profile', None) is None:
+            return parent(*args, **kwargs)
+        return self._profile_phase(name, parent, args, kwargs)
+    method.__name__ = str(name)
+    return method
+
+
+class MemoryProfilingMixin(object):
+    """
+    A mixin for wizard views which traces the memory allocated per phase
+    (see `PROFILED_PHASES`) and step with ``tracemalloc``, for requests where
+    profiling is enabled:
+
+    * for all requests if the ``MULTIPLEFORMWIZARD_MEMORY_PROFILING`` setting
+      is True, or
+    * in ``DEBUG`` mode, for requests with an ``X-Wizard-Memory-Profile``
+      header.
+
+    The results are logged to the ``multipleformwizard.profiling`` logger and
+    kept in `memory_profile`. If ``MULTIPLEFORMWIZARD_MEMORY_PROFILING_DIR`` is
+    set, a ``tracemalloc`` snapshot is written there at the end of the request.
+
+    Tracing slows requests down considerably, don't enable it in production.
+    Before Python 3.9, the peak of a phase is the peak since tracing started.
+    The traced memory is process-wide, the profiles of concurrent requests
+    include each other's allocations.
+    """
+    memory_profiling_header = 'HTTP_X_WIZARD_MEMORY_PROFILE'
+    memory_profile = None
+
+    def memory_profiling_enabled(self, request):
+        if tracemalloc is None:
+            return False
+        if getattr(settings, 'MULTIPLEFORMWIZARD_MEMORY_PROFILING', False):
+            return True
+        return settings.DEBUG and self.memory_profiling_header in request.META
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.memory_profiling_enabled(request):
+            return super(MemoryProfilingMixin, self).dispatch(request, *args, **kwargs)
+
+        _start_tracing()
+        self.memory_profile = OrderedDict()
+        self._memory_stack = []
+        try:
+            response = self._profile_phase(
+                'dispatch', super(MemoryProfilingMixin, self).dispatch, (request,) + args, kwargs)
+            self.log_memory_profile(request)
+            self.dump_memory_snapshot()
+        finally:
+            _stop_tracing()
+        return response
+
+    def _profile_phase(self, phase, method, args, kwargs):
+        if phase == 'get_forms':
+            step = kwargs.get('step', args[0] if args else None) or self.steps.current
+        elif phase == 'dispatch':
+            step = None
+        else:
+            step = self.steps.current
+
+        before = tracemalloc.get_traced_memory()[0]
+        if hasattr(tracemalloc, 'reset_peak'):
+            # Keep the peak of the enclosing phase so far before resetting it
+            if self._memory_stack:
+                self._memory_stack[-1][0] = max(self._memory_stack[-1][0], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        # [the highest peak of the nested phases]
+        frame = [0]
+        self._memory_stack.append(frame)
+        try:
+            result = method(*args, **kwargs)
+            if hasattr(result, 'render') and not getattr(result, 'is_rendered', True):
+                # Render template responses now, so their allocations are
+                # attributed to this phase.
+                result.render()
+            return result
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, frame[0])
+            self._memory_stack.pop()
+            if self._memory_stack:
+                self._memory_stack[-1][0] = max(self._memory_stack[-1][0], peak)
+
+            key = (phase, step)
+            if key not in self.memory_profile:
+                self.memory_profile[key] = PhaseMemory(phase, step)
+            phase_memory = self.memory_profile[key]
+            phase_memory.calls += 1
+            phase_memory.peak = max(phase_memory.peak, peak - before)
+            phase_memory.retained += current - before
+
+    def log_memory_profile(self, request):
+        for phase_memory in self.memory_profile.values():
+            logger.info('%s %s %s: %s %s, %d calls, peak %d bytes, retained %d bytes',
+                        request.method, request.path, self.__class__.__name__,
+                        phase_memory.phase, phase_memory.step or '-', phase_memory.calls,
+                        phase_memory.peak, phase_memory.retained)
+
+    def dump_memory_snapshot(self):
+        directory = getattr(settings, 'MULTIPLEFORMWIZARD_MEMORY_PROFILING_DIR', None)
+        if not directory:
+            return None
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        path = os.path.join(directory, '%s-%s-%d.tracemalloc' % (
+            self.__class__.__name__, self.steps.current, int(time.time() * 1000000)))
+        tracemalloc.take_snapshot().dump(path)
+        return path
+
+    get = _profiled('get')
+    post = _profiled('post')
+    get_forms = _profiled('get_forms')
+    render = _profiled('render')
+    get_all_cleaned_data_dict = _profiled('get_all_cleaned_data_dict')
+    render_done = _profiled('render_done')
@@ -0,0 +1,77 @@
+from __future__ import unicode_literals
+import six
+
+try:
+    from collections.abc import Mapping, Sequence
+except ImportError:  # Python 2
+    from collections import Mapping, Sequence
+
+
+class WizardResult(Mapping):
+    """
+    The validated forms passed to `done`, in form list order. Read-only.
+
+    The result maps step names to the form of the step, or to an ordered
+    dictionary of `tag` -> form for steps with multiple forms. It can also be
+    indexed by position (``result[0]``) and by step name and tag
+    (``result['step', 'tag']``). `form_list` is a sequence view on it.
+    """
+    __slots__ = ('_steps', '_entries')
+
+    def __init__(self):
+        self._steps = []
+        self._entries = []
+
+    def _add(self, step, entry):
+        self._steps.append(step)
+        self._entries.append(entry)
+
+    def __getitem__(self, key):
+        if isinstance(key, six.integer_types):
+            return self._entries[key]
+        if isinstance(key, tuple):
+            step, tag = key
+            return self[step][tag]
+        try:
+            return self._entries[self._steps.index(key)]
+        except ValueError:
+            raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._steps)
+
+    def __len__(self):
+        return len(self._steps)
+
+    def __contains__(self, step):
+        return step in self._steps
+
+    def __repr__(self):
+        return '<WizardResult: %s>' % ', '.join(self._steps)
+
+    @property
+    def form_list(self):
+        return FormList(self)
+
+
+class FormList(Sequence):
+    """
+    A sequence view on a `WizardResult`, with the form of every step in form
+    list order. As before, a step with multiple forms is a dictionary of `tag`
+    -> form, unless it has a single form.
+    """
+    __slots__ = ('_result',)
+
+    def __init__(self, result):
+        self._result = result
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        entry = self._result[index]
+        if isinstance(entry, dict) and len(entry) == 1:
+            return next(iter(entry.values()))
+        return entry
+
+    def __len__(self):
+        return len(self._result)
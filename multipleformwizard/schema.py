@@ -0,0 +1,105 @@
+from __future__ import unicode_literals
+import re
+from collections import OrderedDict
+
+from django import forms
+from django.core.validators import RegexValidator
+from django.forms import formsets
+
+FIELD_ATTRIBUTES = ('max_length', 'min_length', 'max_value', 'min_value', 'max_digits', 'decimal_places')
+
+# The flags of Python regular expressions with a JavaScript equivalent
+REGEX_FLAGS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'))
+
+_schema_cache = {}
+
+
+def get_form_schema(form_class):
+    """
+    Returns a machine-readable description of the validation rules of the
+    `base_fields` of a form (or formset) class, for client-side validation.
+    The result is cached per form class and should not be modified.
+
+    Fields that are added or changed when the form is instantiated are not
+    included, neither are the choices of a ``ModelChoiceField``.
+    """
+    try:
+        return _schema_cache[form_class]
+    except KeyError:
+        pass
+
+    if issubclass(form_class, formsets.BaseFormSet):
+        schema = OrderedDict([
+            ('formset', True),
+            ('min_num', getattr(form_class, 'min_num', 0)),
+            ('max_num', form_class.max_num),
+            ('fields', get_form_schema(form_class.form)['fields']),
+        ])
+    else:
+        schema = OrderedDict([
+            ('fields', OrderedDict(
+                (name, get_field_schema(field)) for name, field in form_class.base_fields.items())),
+        ])
+    _schema_cache[form_class] = schema
+    return schema
+
+
+def get_field_schema(field):
+    schema = OrderedDict([
+        ('type', field.__class__.__name__),
+        ('required', field.required),
+    ])
+    for attribute in FIELD_ATTRIBUTES:
+        value = getattr(field, attribute, None)
+        if value is not None:
+            schema[attribute] = value
+
+    if isinstance(field, forms.ChoiceField) and not isinstance(field, forms.ModelChoiceField):
+        choices = []
+        for value, label in field.choices:
+            if isinstance(label, (list, tuple)):
+                # An option group
+                choices.extend(option_value for option_value, option_label in label)
+            else:
+                choices.append(value)
+        schema['choices'] = choices
+
+    regexes = []
+    for validator in field.validators:
+        if isinstance(validator, RegexValidator):
+            regex = get_js_regex(validator.regex)
+            if regex is not None:
+                regex['inverse_match'] = getattr(validator, 'inverse_match', False)
+                regexes.append(regex)
+    if regexes:
+        schema['regex'] = regexes
+    return schema
+
+
+def get_js_regex(regex):
+    """
+    Returns the `pattern` and `flags` of the JavaScript equivalent of a
+    compiled Python regular expression, or None if it uses syntax without
+    equivalent (lookbehinds, named groups, inline flags or verbose mode).
+    ``\\A`` and ``\\Z`` are translated to ``^`` and ``$``.
+    """
+    if regex.flags & re.VERBOSE:
+        return None
+    pattern = []
+    source = regex.pattern
+    index = 0
+    while index < len(source):
+        char = source[index]
+        if char == '\\':
+            escape = source[index:index + 2]
+            pattern.append({'\\A': '^', '\\Z': '$'}.get(escape, escape))
+            index += 2
+            continue
+        if char == '(' and source[index + 1:index + 2] == '?' and source[index + 2:index + 3] not in (':', '=', '!'):
+            return None
+        pattern.append(char)
+        index += 1
+    return OrderedDict([
+        ('pattern', ''.join(pattern)),
+        ('flags', ''.join(flag for bit, flag in REGEX_FLAGS if regex.flags & bit)),
+    ])
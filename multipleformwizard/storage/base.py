@@ -0,0 +1,59 @@
+from __future__ import unicode_literals
+
+
+class CachedReadStorageMixin(object):
+    """
+    Memoizes the step data and files read from a formtools storage backend,
+    so the data of a step is decoded and its files are opened at most once per
+    request. Writing the data or files of a step invalidates them.
+
+    The returned data and files are shared between the callers and should not
+    be modified.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # Some backends initialize their data in __init__
+        self._step_data_cache = {}
+        self._step_files_cache = {}
+        self._stale_files = []
+        super(CachedReadStorageMixin, self).__init__(*args, **kwargs)
+
+    def init_data(self):
+        super(CachedReadStorageMixin, self).init_data()
+        self._step_data_cache.clear()
+        self._step_files_cache.clear()
+
+    def get_step_data(self, step):
+        if step not in self._step_data_cache:
+            self._step_data_cache[step] = super(CachedReadStorageMixin, self).get_step_data(step)
+        return self._step_data_cache[step]
+
+    def set_step_data(self, step, cleaned_data):
+        super(CachedReadStorageMixin, self).set_step_data(step, cleaned_data)
+        self._step_data_cache.pop(step, None)
+
+    def get_step_files(self, step):
+        if step not in self._step_files_cache:
+            self._step_files_cache[step] = super(CachedReadStorageMixin, self).get_step_files(step)
+        return self._step_files_cache[step]
+
+    def set_step_files(self, step, files):
+        super(CachedReadStorageMixin, self).set_step_files(step, files)
+        self._step_files_cache.pop(step, None)
+        # The files opened for the previous data of this step are closed at
+        # the end of the response.
+        for key in [key for key in self._files if key[0] == step]:
+            self._stale_files.append(self._files.pop(key))
+
+    def update_response(self, response):
+        super(CachedReadStorageMixin, self).update_response(response)
+
+        def close_stale_files(response):
+            for stale_file in self._stale_files:
+                if not stale_file.closed:
+                    stale_file.close()
+
+        if hasattr(response, 'render'):
+            response.add_post_render_callback(close_stale_files)
+        else:
+            close_stale_files(response)
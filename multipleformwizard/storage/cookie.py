@@ -0,0 +1,11 @@
+from __future__ import unicode_literals
+
+from formtools.wizard.storage.cookie import CookieStorage as BaseCookieStorage
+
+from .base import CachedReadStorageMixin
+
+
+class CookieStorage(CachedReadStorageMixin, BaseCookieStorage):
+    """
+    A CookieStorage backend with memoized step data and files.
+    """
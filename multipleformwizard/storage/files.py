@@ -0,0 +1,136 @@
+from __future__ import unicode_literals
+import errno
+import hashlib
+import os
+import tempfile
+import time
+
+import six
+from django.core.files.storage import FileSystemStorage
+
+
+class ContentHashFileStorage(FileSystemStorage):
+    """
+    A `file_storage` for wizard views which stores every distinct upload only
+    once, across steps and wizard instances.
+
+    Uploads are streamed in chunks into a blob named after the hash of their
+    content. The name returned by `save` is a hard link to that blob, below a
+    directory per hour of upload. The wizard storage deletes that name when it
+    is reset, so the number of links to a blob counts its references. `purge`
+    removes the names of abandoned wizards and the blobs nobody refers to.
+    """
+    blob_directory = '.blobs'
+    hash_algorithm = 'sha256'
+    upload_directory_format = '%Y%m%d%H'
+    # Unreferenced blobs younger than this (in seconds) can still be in the
+    # process of being saved.
+    purge_grace_period = 3600
+
+    def _save(self, name, content):
+        blob_root = self.path(self.blob_directory)
+        self._makedirs(blob_root)
+
+        checksum = hashlib.new(self.hash_algorithm)
+        fd, tmp_path = tempfile.mkstemp(dir=blob_root)
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                for chunk in content.chunks():
+                    if isinstance(chunk, six.text_type):
+                        chunk = chunk.encode('utf-8')
+                    checksum.update(chunk)
+                    tmp_file.write(chunk)
+
+            digest = checksum.hexdigest()
+            blob_path = os.path.join(blob_root, digest[:2], digest)
+            self._makedirs(os.path.dirname(blob_path))
+            if not os.path.exists(blob_path):
+                os.rename(tmp_path, blob_path)
+                if self.file_permissions_mode is not None:
+                    os.chmod(blob_path, self.file_permissions_mode)
+
+            name = self.get_available_name(os.path.join(
+                time.strftime(self.upload_directory_format, time.gmtime()), name))
+            self._makedirs(os.path.dirname(self.path(name)))
+            while True:
+                try:
+                    os.link(blob_path, self.path(name))
+                except OSError as e:
+                    if e.errno == errno.EEXIST:
+                        # The name was taken concurrently, try another one
+                        name = self.get_available_name(name)
+                    elif e.errno == errno.ENOENT and os.path.exists(tmp_path):
+                        # The blob was purged concurrently, restore it
+                        os.rename(tmp_path, blob_path)
+                    else:
+                        raise
+                else:
+                    break
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return name
+
+    def _makedirs(self, directory):
+        try:
+            if self.directory_permissions_mode is not None:
+                old_umask = os.umask(0)
+                try:
+                    os.makedirs(directory, self.directory_permissions_mode)
+                finally:
+                    os.umask(old_umask)
+            else:
+                os.makedirs(directory)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+    def references(self, name):
+        """
+        Returns the number of stored names referring to the content of `name`.
+        """
+        return os.stat(self.path(name)).st_nlink - 1
+
+    def purge(self, max_age=None):
+        """
+        Deletes the stored names older than `max_age` seconds (if given) and
+        the blobs which are no longer referred to. Returns the number of
+        deleted names and blobs.
+        """
+        deleted_names = deleted_blobs = 0
+        if not os.path.isdir(self.location):
+            return deleted_names, deleted_blobs
+
+        if max_age is not None:
+            oldest = time.strftime(self.upload_directory_format, time.gmtime(time.time() - max_age))
+            for directory in os.listdir(self.location):
+                path = os.path.join(self.location, directory)
+                if not os.path.isdir(path) or directory >= oldest:
+                    continue
+                try:
+                    time.strptime(directory, self.upload_directory_format)
+                except ValueError:
+                    continue
+                for root, dirs, files in os.walk(path, topdown=False):
+                    for filename in files:
+                        os.remove(os.path.join(root, filename))
+                        deleted_names += 1
+                    os.rmdir(root)
+
+        blob_root = self.path(self.blob_directory)
+        newest = time.time() - self.purge_grace_period
+        for root, dirs, files in os.walk(blob_root):
+            if root == blob_root:
+                # Uploads being streamed
+                continue
+            for filename in files:
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                    if stat.st_nlink == 1 and stat.st_mtime < newest:
+                        os.remove(path)
+                        deleted_blobs += 1
+                except OSError as e:
+                    if e.errno != errno.ENOENT:
+                        raise
+        return deleted_names, deleted_blobs
@@ -0,0 +1,68 @@
+from __future__ import unicode_literals
+
+from django.core import signing
+from django.utils.encoding import python_2_unicode_compatible
+from django.utils.html import format_html
+
+from formtools.wizard.storage.base import BaseStorage
+
+from .base import CachedReadStorageMixin
+
+
+class HiddenFieldStorage(CachedReadStorageMixin, BaseStorage):
+    """
+    A storage backend that keeps the wizard data in a signed and compressed
+    hidden field of the wizard form, so no state is kept on the server.
+
+    The field is rendered by ``{{ wizard.state_field }}`` and read back from
+    the POST data of the next request. Data with an invalid signature, signed
+    for another wizard, or older than `max_age` seconds, is ignored.
+
+    The data is signed, not encrypted: the client can read it. It can also
+    post a state it received before again, until it expires.
+    """
+    salt = 'multipleformwizard.storage.hidden'
+    max_age = 60 * 60
+
+    def __init__(self, *args, **kwargs):
+        super(HiddenFieldStorage, self).__init__(*args, **kwargs)
+        self.data = self.load_data()
+        if self.data is None:
+            self.init_data()
+
+    def load_data(self):
+        if self.request.method != 'POST' or self.prefix not in self.request.POST:
+            return None
+        try:
+            return signing.loads(self.request.POST[self.prefix], salt=self.get_salt(), max_age=self.max_age)
+        except signing.BadSignature:
+            return None
+
+    def dump_data(self):
+        return signing.dumps(self.data, salt=self.get_salt(), compress=True)
+
+    def get_salt(self):
+        # The state of one wizard is not valid for another one
+        return '%s:%s' % (self.salt, self.prefix)
+
+    @property
+    def state_field(self):
+        return StateField(self)
+
+
+@python_2_unicode_compatible
+class StateField(object):
+    """
+    The hidden field holding the wizard data of a `HiddenFieldStorage`. The
+    data is signed when the field is rendered, after the view processed it.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+
+    def __str__(self):
+        return format_html('<input type="hidden" name="{0}" value="{1}" />',
+                           self.storage.prefix, self.storage.dump_data())
+
+    def __html__(self):
+        return self.__str__()
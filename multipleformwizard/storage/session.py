@@ -0,0 +1,11 @@
+from __future__ import unicode_literals
+
+from formtools.wizard.storage.session import SessionStorage as BaseSessionStorage
+
+from .base import CachedReadStorageMixin
+
+
+class SessionStorage(CachedReadStorageMixin, BaseSessionStorage):
+    """
+    A SessionStorage backend with memoized step data and files.
+    """
@@ -0,0 +1,203 @@
+from __future__ import unicode_literals
+from collections import OrderedDict
+
+import six
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+# The wizard view methods whose queries are reported separately, queries
+# executed outside of them (middleware, storage, ...) are reported as 'other'.
+PROFILED_PHASES = ('get_forms', 'render', 'get_all_cleaned_data_dict', 'render_done', 'done')
+
+
+class StepQueries(object):
+    """
+    The queries executed by a single request to the wizard.
+
+    * `step` - the submitted step for a POST request, the rendered step for a
+      GET request.
+    * `phases` - an ordered dictionary of phase name -> number of queries. The
+      queries of nested phases are not included in the outer phase.
+    * `queries` - the executed queries, as captured by ``CaptureQueriesContext``.
+    """
+
+    def __init__(self, step, method):
+        self.step = step
+        self.method = method
+        self.phases = OrderedDict()
+        self.queries = []
+
+    def __repr__(self):
+        return '<StepQueries %s %s: %s>' % (self.method, self.step, self.total)
+
+    @property
+    def total(self):
+        return len(self.queries)
+
+
+class WizardQueryProfile(list):
+    """
+    A list of `StepQueries`, one for every request made while driving a wizard.
+    """
+
+    def for_step(self, step):
+        return [step_queries for step_queries in self if step_queries.step == step]
+
+    def over_budget(self, budgets):
+        """
+        Returns the `StepQueries` which executed more queries than allowed by
+        `budgets`, a dictionary of step name -> maximum number of queries.
+        """
+        return [step_queries for step_queries in self
+                if step_queries.step in budgets and step_queries.total > budgets[step_queries.step]]
+
+
+class WizardQueryProfiler(object):
+    """
+    Drives a wizard through its steps with the Django test client and records
+    the queries executed per step and per phase.
+
+    Example:
+
+    .. code-block:: python
+
+        profile = WizardQueryProfiler(MyWizard, '/wizard/').run([
+            ('start', {'start-name': 'John'}),
+            ('user_info', {'user_info-username': 'john', 'user_info-city': 'Ghent'}),
+        ])
+    """
+    phases = PROFILED_PHASES
+
+    def __init__(self, wizard_class, url, client=None, using=DEFAULT_DB_ALIAS):
+        self.wizard_class = wizard_class
+        self.url = url
+        self.client = client or Client()
+        self.connection = connections[using]
+        self._context = None
+        self._current = None
+        self._stack = []
+
+    def get_prefix(self):
+        return self.wizard_class().get_prefix(None)
+
+    def run(self, steps):
+        """
+        Starts the wizard with a GET request and posts the data of every
+        (`step`, `data`) pair in `steps`, in order. The management form data of
+        the rendered step is added to `data`. Redirects are followed and
+        counted for the request that caused them. Returns a
+        `WizardQueryProfile`.
+        """
+        profile = WizardQueryProfile()
+        originals = self._instrument()
+        try:
+            url = self.url
+            response, step_queries = self._request(None, 'GET', url)
+            step_queries.step = self._get_rendered_step(response)
+            profile.append(step_queries)
+
+            for step, data in steps:
+                url = response.request['PATH_INFO']
+                if response.request.get('QUERY_STRING'):
+                    url = '%s?%s' % (url, response.request['QUERY_STRING'])
+                data = dict(self._get_management_data(response), **data)
+                data['%s-current_step' % self.get_prefix()] = step
+                response, step_queries = self._request(step, 'POST', url, data)
+                profile.append(step_queries)
+        finally:
+            self._restore(originals)
+        return profile
+
+    def _request(self, step, method, url, data=None):
+        self._current = StepQueries(step, method)
+        with CaptureQueriesContext(self.connection) as context:
+            self._context = context
+            if method == 'GET':
+                response = self.client.get(url, follow=True)
+            else:
+                response = self.client.post(url, data, follow=True)
+        self._context = None
+
+        self._current.queries = context.captured_queries
+        attributed = sum(six.itervalues(self._current.phases))
+        if self._current.total > attributed:
+            self._current.phases['other'] = self._current.total - attributed
+        return response, self._current
+
+    def _get_management_data(self, response):
+        try:
+            management_form = response.context['wizard']['management_form']
+        except (TypeError, KeyError):
+            return {}
+        return dict((management_form.add_prefix(name), management_form.initial.get(name))
+                    for name in management_form.fields)
+
+    def _get_rendered_step(self, response):
+        try:
+            return response.context['wizard']['steps'].current
+        except (TypeError, KeyError):
+            return None
+
+    def _instrument(self):
+        originals = {}
+        for name in self.phases:
+            originals[name] = self.wizard_class.__dict__.get(name, None)
+            setattr(self.wizard_class, name, self._wrap(name, getattr(self.wizard_class, name)))
+        return originals
+
+    def _restore(self, originals):
+        for name, original in six.iteritems(originals):
+            if original is None:
+                delattr(self.wizard_class, name)
+            else:
+                setattr(self.wizard_class, name, original)
+
+    def _wrap(self, name, func):
+        profiler = self
+
+        def wrapper(view, *args, **kwargs):
+            if profiler._context is None:
+                return func(view, *args, **kwargs)
+            nested = [0]
+            profiler._stack.append(nested)
+            start = len(profiler._context)
+            try:
+                result = func(view, *args, **kwargs)
+                if hasattr(result, 'render') and not getattr(result, 'is_rendered', True):
+                    # Render template responses now, so their queries are
+                    # attributed to this phase.
+                    result.render()
+                return result
+            finally:
+                profiler._stack.pop()
+                total = len(profiler._context) - start
+                phases = profiler._current.phases
+                phases[name] = phases.get(name, 0) + total - nested[0]
+                if profiler._stack:
+                    profiler._stack[-1][0] += total
+        return wrapper
+
+
+class WizardQueryBudgetMixin(object):
+    """
+    A ``TestCase`` mixin asserting that no step of a wizard executes more
+    queries than allowed by the `query_budget_dict` of the wizard class.
+    """
+
+    def assertWizardQueryBudgets(self, wizard_class, url, steps, budgets=None):
+        if budgets is None:
+            budgets = wizard_class.query_budget_dict or {}
+        profile = WizardQueryProfiler(wizard_class, url, client=self.client).run(steps)
+
+        failures = profile.over_budget(budgets)
+        if failures:
+            lines = []
+            for step_queries in failures:
+                lines.append('%s %s executed %d queries, the budget is %d (%s):' % (
+                    step_queries.method, step_queries.step, step_queries.total,
+                    budgets[step_queries.step],
+                    ', '.join('%s=%d' % phase for phase in six.iteritems(step_queries.phases))))
+                lines.extend('    %s' % query['sql'] for query in step_queries.queries)
+            self.fail('\n'.join(lines))
+        return profile
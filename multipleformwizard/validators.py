@@ -0,0 +1,163 @@
+from __future__ import unicode_literals
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+
+
+class ValidatorCache(object):
+    """
+    An in-process cache for the results of form clean methods, which evicts
+    results after `timeout` seconds or when it holds more than `max_size`
+    results, the least recently used first.
+    """
+
+    def __init__(self, max_size=1000, timeout=300):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns a tuple of (`found`, `result`).
+        """
+        with self._lock:
+            try:
+                expires, result = self._results.pop(key)
+            except KeyError:
+                self.misses += 1
+                return False, None
+            if expires < time.time():
+                self.misses += 1
+                return False, None
+            self._results[key] = (expires, result)
+            self.hits += 1
+            return True, result
+
+    def set(self, key, result, timeout=None):
+        if timeout is None:
+            timeout = self.timeout
+        with self._lock:
+            self._results.pop(key, None)
+            self._results[key] = (time.time() + timeout, result)
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self.hits = self.misses = 0
+
+
+class DjangoValidatorCache(object):
+    """
+    A cache for the results of form clean methods backed by one of the caches
+    in the ``CACHES`` setting, to share the results between processes. The
+    results (and validation errors) must be picklable.
+    """
+    key_prefix = 'multipleformwizard.validators'
+
+    def __init__(self, alias='default', timeout=300):
+        self.alias = alias
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, key):
+        return '%s.%s' % (self.key_prefix, hashlib.sha1(repr(key).encode('utf-8')).hexdigest())
+
+    def get(self, key):
+        found = caches[self.alias].get(self.make_key(key))
+        if found is None:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, found[0]
+
+    def set(self, key, result, timeout=None):
+        if timeout is None:
+            timeout = self.timeout
+        caches[self.alias].set(self.make_key(key), (result,), timeout)
+
+    def clear(self):
+        self.hits = self.misses = 0
+
+
+default_cache = ValidatorCache()
+
+
+def normalize_value(value):
+    """
+    Returns a hashable version of a cleaned value, lists become tuples. Pass
+    your own `normalize` function to `cached_clean` to treat different ways of
+    writing the same value (like spacing or case) as equal.
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize_value(item) for item in value)
+    return value
+
+
+def cached_clean(timeout=None, cache=None, normalize=normalize_value):
+    """
+    Decorator for ``clean_<fieldname>`` methods of forms, which memoizes their
+    result (or validation error) per form class, field and normalized value.
+    Only use it for methods that depend on nothing but the value of their field.
+
+    Example:
+
+    .. code-block:: python
+
+        class CompanyForm(forms.Form):
+            vat_number = forms.CharField()
+
+            @cached_clean(timeout=3600)
+            def clean_vat_number(self):
+                return lookup_vat_number(self.cleaned_data['vat_number'])
+
+    Wizards revalidate their stored data on most requests, so repeated
+    validation of the same value only calls the method once per `timeout`.
+    """
+    def decorator(method):
+        assert method.__name__.startswith('clean_'), 'cached_clean decorates clean_<fieldname> methods'
+        field_name = method.__name__[len('clean_'):]
+
+        @wraps(method)
+        def wrapper(form):
+            result_cache = cache or default_cache
+            key = (form.__class__.__module__, form.__class__.__name__, field_name,
+                   normalize(form.cleaned_data.get(field_name)))
+            found, result = result_cache.get(key)
+            if found:
+                if isinstance(result, ValidationError):
+                    raise ValidationError(result)
+                return result
+
+            try:
+                result = method(form)
+            except ValidationError as e:
+                # The traceback of the raised error keeps the form alive
+                result_cache.set(key, _copy_error(e), timeout)
+                raise
+            result_cache.set(key, result, timeout)
+            return result
+        return wrapper
+    return decorator
+
+
+def _copy_error(error):
+    """
+    Returns a copy of a ``ValidationError`` which was never raised.
+    """
+    if hasattr(error, 'error_dict'):
+        return ValidationError(dict(
+            (field, _copy_error(ValidationError(errors)).error_list)
+            for field, errors in error.error_dict.items()))
+    return ValidationError([
+        ValidationError(e.message, code=e.code, params=e.params) for e in error.error_list])
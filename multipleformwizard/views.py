@@ -1,23 +1,56 @@
 from __future__ import unicode_literals
+import json
 import six
+import threading
 from collections import OrderedDict
 
 from django import forms
 from django.core.exceptions import ValidationError
-from django.core.urlresolvers import reverse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.urlresolvers import get_script_prefix, get_urlconf, reverse
 from django.forms import formsets
+from django.forms.widgets import Media
+from django.http import Http404, HttpResponse
 from django.shortcuts import redirect
+from django.utils import translation
 from django.utils.translation import ugettext_lazy as _
 
+from formtools.wizard.storage import get_storage
 from formtools.wizard.storage.exceptions import NoFileStorageConfigured
-from formtools.wizard.views import ManagementForm, WizardView as BaseWizardView
+from formtools.wizard.views import ManagementForm, StepsHelper, WizardView as BaseWizardView
+
+from .results import WizardResult
+from .schema import get_form_schema
+
+# Maximum number of step URL tables kept for all NamedUrl wizards, see
+# NamedUrlMultipleFormWizardView.get_step_urls
+STEP_URLS_CACHE_SIZE = 128
 
 
 class MultipleFormWizardView(BaseWizardView):
     template_name = 'multipleformwizard/wizard_form.html'
     cleaned_data_in_context = False
+    schema_in_context = False
+    # Validate the steps before a requested step before going there
+    validate_goto_step = False
+    # Maximum number of queries per step, see multipleformwizard.testing
+    query_budget_dict = None
     _form_list_factory = None
 
+    @classmethod
+    def as_view(cls, *args, **kwargs):
+        """
+        This method is used within urls.py to create unique wizardview
+        instances for every request. The view function gets the wizard class
+        and its computed kwargs as `view_class` and `view_initkwargs`, for the
+        system checks.
+        """
+        initkwargs = cls.get_initkwargs(*args, **kwargs)
+        view = super(BaseWizardView, cls).as_view(**initkwargs)
+        view.view_class = cls
+        view.view_initkwargs = initkwargs
+        return view
+
     @classmethod
     def get_initkwargs(cls, form_list=None, initial_dict=None,
             instance_dict=None, condition_dict=None, *args, **kwargs):
@@ -92,7 +125,6 @@ class MultipleFormWizardView(BaseWizardView):
 
         # walk through the new created list of forms
         for form in six.itervalues(computed_form_list):
-            form_collection = []
             if isinstance(form, dict):
                 form_collection = form.values()
             elif issubclass(form, formsets.BaseFormSet):
@@ -100,6 +132,8 @@ class MultipleFormWizardView(BaseWizardView):
                 # we need to override the form variable.
                 form = form.form
                 form_collection = [form]
+            else:
+                form_collection = [form]
 
             for form in form_collection:
                 # must test for BaseFormSet again in case form_collection
@@ -136,9 +170,7 @@ class MultipleFormWizardView(BaseWizardView):
         # get the form instance based on the data from the storage backend
         # (if available).
         next_step = self.steps.next
-        new_forms = self.get_forms(next_step,
-            data=self.storage.get_step_data(next_step),
-            files=self.storage.get_step_files(next_step))
+        new_forms = self.get_stored_forms(next_step)
 
         # change the stored current step
         self.storage.current_step = next_step
@@ -149,10 +181,8 @@ class MultipleFormWizardView(BaseWizardView):
         This method gets called when the current step has to be changed.
         `goto_step` contains the requested step to go to.
         """
-        self.storage.current_step = goto_step
-        forms = self.get_forms(
-            data=self.storage.get_step_data(self.steps.current),
-            files=self.storage.get_step_files(self.steps.current))
+        self.storage.current_step = self.get_goto_step(goto_step)
+        forms = self.get_stored_forms(self.steps.current)
         return self.render(forms)
 
     def render_done(self, form, **kwargs):
@@ -160,50 +190,56 @@ class MultipleFormWizardView(BaseWizardView):
         This method gets called when all forms passed. The method should also
         re-validate all steps to prevent manipulation. If any form fails to
         validate, `render_revalidation_failure` should get called.
-        If everything is fine call `done`.
+        If everything is fine call `done`, with the validated forms as a
+        `WizardResult` (`form_dict`) and its `form_list` view.
         """
-        final_forms = OrderedDict()
+        result = WizardResult()
         # walk through the form list and try to validate the data again.
         for form_key in self.get_form_list():
-            form_objs = self.get_forms(step=form_key,
-                data=self.storage.get_step_data(form_key),
-                files=self.storage.get_step_files(form_key))
-            final_forms[form_key] = []
+            form_objs = self.get_stored_forms(form_key)
             for form_obj in form_objs:
                 if not form_obj.is_valid():
                     return self.render_revalidation_failure(form_key, form_obj, **kwargs)
-                final_forms[form_key].append(form_obj)
-
-        result_forms = {}
-        result_forms_dict = {}
-        for form_key in final_forms:
-            formcollection = final_forms[form_key]
-            result_forms_dict[form_key] = {}
-            for form in formcollection:
-                if hasattr(form, '_tag'):
-                    result_forms_dict[form_key][form._tag] = form
-
-            if len(formcollection) == 1:
-                result_forms[form_key] = formcollection[0]
-            elif len(formcollection) > 1:
-                # We expect a _tag property
-                formcollection_dict = {}
-                for form in formcollection:
-                    formcollection_dict[form._tag] = form
-                    delattr(form, '_tag')
-                result_forms[form_key] = formcollection_dict
-
-
-        # Construct a result list, ordered by step number
-        form_list = [result_forms[key] for key in sorted(result_forms.keys())]
+            if isinstance(self.form_list[form_key], dict):
+                result._add(form_key, OrderedDict((form_obj._tag, form_obj) for form_obj in form_objs))
+            else:
+                result._add(form_key, form_objs[0])
 
         # render the done view and reset the wizard before returning the
         # response. This is needed to prevent from rendering done with the
         # same data twice.
-        done_response = self.done(form_list=form_list, form_dict=result_forms_dict, **kwargs)
+        done_response = self.done(form_list=list(result.form_list), form_dict=result, **kwargs)
         self.storage.reset()
         return done_response
 
+    def dispatch(self, request, *args, **kwargs):
+        """
+        This method gets called by the routing engine. The first argument is
+        `request` which contains a `HttpRequest` instance.
+        The request is stored in `self.request` for later use. The storage
+        instance is stored in `self.storage`.
+
+        After processing the request using the `dispatch` method, the
+        response gets updated by the storage engine (for example add cookies).
+        """
+        # add the storage engine to the current wizardview instance
+        self.prefix = self.get_prefix(request, *args, **kwargs)
+        self.storage = get_storage(self.storage_name, self.get_storage_prefix(request, *args, **kwargs),
+                                   request, getattr(self, 'file_storage', None))
+        self.steps = StepsHelper(self)
+        response = super(BaseWizardView, self).dispatch(request, *args, **kwargs)
+
+        # update the response (e.g. adding cookies)
+        self.storage.update_response(response)
+        return response
+
+    def get_storage_prefix(self, request, *args, **kwargs):
+        """
+        Returns the prefix under which the storage keeps the wizard state, the
+        wizard `prefix` by default.
+        """
+        return self.prefix
+
     def get(self, request, *args, **kwargs):
         """
         This method handles GET requests.
@@ -214,6 +250,9 @@ class MultipleFormWizardView(BaseWizardView):
         """
         self.ensure_form_list()
 
+        if 'wizard_schema' in self.request.GET:
+            return self.render_schema(self.request.GET['wizard_schema'] or None)
+
         self.storage.reset()
 
         # reset the current step to the first step.
@@ -238,7 +277,7 @@ class MultipleFormWizardView(BaseWizardView):
             return self.render_goto_step(wizard_goto_step)
 
         # Check if form was refreshed
-        management_form = ManagementForm(self.request.POST, prefix=self.prefix)
+        management_form = self.get_management_form(data=self.request.POST)
         if not management_form.is_valid():
             raise ValidationError(
                 _('ManagementForm data is missing or has been tampered.'),
@@ -255,15 +294,20 @@ class MultipleFormWizardView(BaseWizardView):
         forms = self.get_forms(data=self.request.POST, files=self.request.FILES)
 
         # and try to validate
-        all_valid = True
-        for form in forms:
-            if not form.is_valid():
-                all_valid = False
+        if self.validate_forms(forms):
+            # The forms of a step share the posted data and files, the last
+            # one is passed on to process the step.
+            form = forms[-1]
 
-        if all_valid:
             # if the form is valid, store the cleaned data and files.
             self.storage.set_step_data(self.steps.current, self.process_step(form))
             self.storage.set_step_files(self.steps.current, self.process_step_files(form))
+            if self.validate_goto_step:
+                # The later steps can depend on the data of this step, they
+                # have to be validated again.
+                form_list = list(self.get_form_list())
+                later_steps = set(form_list[form_list.index(self.steps.current) + 1:])
+                self.set_verified_steps((self.get_verified_steps() - later_steps) | set([self.steps.current]))
 
             # check if the current step is the last step
             if self.steps.current == self.steps.last:
@@ -275,6 +319,52 @@ class MultipleFormWizardView(BaseWizardView):
 
         return self.render(forms)
 
+    def get_goto_step(self, goto_step):
+        """
+        Returns the step to go to when `goto_step` is requested. If
+        `validate_goto_step` is set, the steps before `goto_step` are validated
+        first, and the first invalid step is returned instead.
+
+        Steps that were validated before, when their data was stored or by a
+        previous call, are not validated again, unless the data of an earlier
+        step was stored since. The final step still revalidates all steps.
+        """
+        if not self.validate_goto_step:
+            return goto_step
+
+        verified_steps = self.get_verified_steps()
+        for step in self.get_form_list():
+            if step == goto_step:
+                break
+            if step in verified_steps:
+                continue
+            if not all([form.is_valid() for form in self.get_stored_forms(step)]):
+                goto_step = step
+                break
+            verified_steps.add(step)
+        self.set_verified_steps(verified_steps)
+        return goto_step
+
+    def get_verified_steps(self):
+        """
+        Returns the set of steps whose stored data was validated.
+        """
+        return set(self.storage.data.get('verified_steps', []))
+
+    def set_verified_steps(self, steps):
+        self.storage.data['verified_steps'] = sorted(steps)
+
+    def validate_forms(self, forms):
+        """
+        Validates the forms of the current step. Returns True if all forms
+        are valid.
+        """
+        all_valid = True
+        for form in forms:
+            if not form.is_valid():
+                all_valid = False
+        return all_valid
+
     def get_forms(self, step=None, data=None, files=None):
         """
         Constructs the form for a given `step`. If no `step` is defined, the
@@ -353,6 +443,55 @@ class MultipleFormWizardView(BaseWizardView):
             form_collection = [form_class(**kwargs)]
         return form_collection
 
+    def get_stored_forms(self, step):
+        """
+        Constructs the forms for a given `step`, bound to the data and files
+        stored for that step in the storage backend.
+        """
+        return self.get_forms(step=step,
+            data=self.storage.get_step_data(step),
+            files=self.storage.get_step_files(step))
+
+    def get_step_schema(self, step):
+        """
+        Returns the client-side validation schema of the forms for a given
+        `step`, see `multipleformwizard.schema.get_form_schema`. For a step with
+        multiple forms, the schemas are grouped per form name.
+        """
+        form_struct = self.form_list[step]
+        if isinstance(form_struct, dict):
+            return OrderedDict(
+                (form_name, self._get_prefixed_schema(step, form_name, form_class))
+                for form_name, form_class in form_struct.items())
+        return self._get_prefixed_schema(step, form_struct, form_struct)
+
+    def _get_prefixed_schema(self, step, form, form_class):
+        schema = OrderedDict([('prefix', self.get_form_prefix(step, form))])
+        schema.update(get_form_schema(form_class))
+        return schema
+
+    def render_schema(self, step=None):
+        """
+        Returns a JSON ``HttpResponse`` with the client-side validation schema
+        of a given `step`, or of all steps grouped per step name.
+        """
+        form_list = self.get_form_list()
+        if step is None:
+            schema = OrderedDict((form_key, self.get_step_schema(form_key)) for form_key in form_list)
+        elif step in form_list:
+            schema = self.get_step_schema(step)
+        else:
+            raise Http404
+        return HttpResponse(json.dumps(schema, cls=DjangoJSONEncoder), content_type='application/json')
+
+    def get_management_form(self, data=None):
+        """
+        Returns the management form, bound to `data` when it is given.
+        """
+        return ManagementForm(data, prefix=self.prefix, initial={
+            'current_step': self.steps.current,
+        })
+
     def get_context_data(self, forms, **kwargs):
         """
         Returns the template context for a step. You can overwrite this method
@@ -387,10 +526,13 @@ class MultipleFormWizardView(BaseWizardView):
         context['wizard'] = {
             'forms': forms,
             'steps': self.steps,
-            'management_form': ManagementForm(prefix=self.prefix, initial={
-                'current_step': self.steps.current,
-            }),
+            'management_form': self.get_management_form(),
+            'state_field': getattr(self.storage, 'state_field', ''),
+            'media': sum((form.media for form in forms), Media()),
         }
+        if self.schema_in_context:
+            context['wizard']['schema'] = json.dumps(
+                self.get_step_schema(self.steps.current), cls=DjangoJSONEncoder)
         return context
 
     def get_all_cleaned_data(self):
@@ -401,11 +543,7 @@ class MultipleFormWizardView(BaseWizardView):
         """
         cleaned_data = {}
         for form_key in self.get_form_list():
-            form_collection = self.get_forms(
-                step=form_key,
-                data=self.storage.get_step_data(form_key),
-                files=self.storage.get_step_files(form_key)
-            )
+            form_collection = self.get_stored_forms(form_key)
             for form_obj in form_collection:
                 if form_obj.is_valid():
                     if isinstance(form_obj.cleaned_data, (tuple, list)):
@@ -424,15 +562,12 @@ class MultipleFormWizardView(BaseWizardView):
         """
         cleaned_data = {}
         if step in self.form_list:
-            form_collection = self.get_forms(
-                step=step,
-                data=self.storage.get_step_data(step),
-                files=self.storage.get_step_files(step))
+            form_collection = self.get_stored_forms(step)
 
             multiple_forms = isinstance(self.form_list[step], dict)
 
             if multiple_forms:
-                multiple_form_keys = self.form_list[step].keys()
+                multiple_form_keys = list(self.form_list[step].keys())
 
             for i, form_obj in enumerate(form_collection):
                 if form_obj.is_valid():
@@ -503,14 +638,25 @@ class SessionMultipleFormWizardView(MultipleFormWizardView):
     """
     A WizardView with pre-configured SessionStorage backend.
     """
-    storage_name = 'formtools.wizard.storage.session.SessionStorage'
+    storage_name = 'multipleformwizard.storage.session.SessionStorage'
 
 
 class CookieMultipleFormWizardView(MultipleFormWizardView):
     """
     A WizardView with pre-configured CookieStorage backend.
     """
-    storage_name = 'formtools.wizard.storage.cookie.CookieStorage'
+    storage_name = 'multipleformwizard.storage.cookie.CookieStorage'
+
+
+class HiddenFieldMultipleFormWizardView(MultipleFormWizardView):
+    """
+    A WizardView with pre-configured HiddenFieldStorage backend. The wizard
+    template has to render ``{{ wizard.state_field }}`` inside the form.
+
+    There is no NamedUrl variant: those wizards move between steps with GET
+    requests, which cannot carry the hidden field.
+    """
+    storage_name = 'multipleformwizard.storage.hidden.HiddenFieldStorage'
 
 
 class NamedUrlMultipleFormWizardView(MultipleFormWizardView):
@@ -519,6 +665,8 @@ class NamedUrlMultipleFormWizardView(MultipleFormWizardView):
     """
     url_name = None
     done_step_name = None
+    _step_urls_cache = OrderedDict()
+    _step_urls_lock = threading.Lock()
 
     @classmethod
     def get_initkwargs(cls, *args, **kwargs):
@@ -541,10 +689,39 @@ class NamedUrlMultipleFormWizardView(MultipleFormWizardView):
             'step name "%s" is reserved for "done" view' % initkwargs['done_step_name']
         return initkwargs
 
+    def get_step_urls(self):
+        """
+        Returns a dictionary of step name -> URL, shared by all requests with
+        the same `url_name`, URL kwargs (except for `step`) and language (for
+        ``i18n_patterns``). The URLs are reversed once, when they are first
+        needed. The least recently used dictionaries of all wizards are
+        dropped when there are more than `STEP_URLS_CACHE_SIZE`.
+        """
+        url_kwargs = tuple(sorted((key, value) for key, value in six.iteritems(self.kwargs) if key != 'step'))
+        cache_key = (self.url_name, url_kwargs, get_script_prefix(), get_urlconf(), translation.get_language())
+        try:
+            hash(cache_key)
+        except TypeError:
+            # Unhashable URL kwargs, don't share the URLs
+            return {}
+
+        with self._step_urls_lock:
+            step_urls = self._step_urls_cache.pop(cache_key, None)
+            if step_urls is None:
+                step_urls = {}
+            self._step_urls_cache[cache_key] = step_urls
+            while len(self._step_urls_cache) > STEP_URLS_CACHE_SIZE:
+                self._step_urls_cache.popitem(last=False)
+        return step_urls
+
     def get_step_url(self, step):
-        kwargs = self.kwargs
-        kwargs.update({'step': step})
-        return reverse(self.url_name, kwargs=kwargs)
+        step_urls = self.get_step_urls()
+        try:
+            return step_urls[step]
+        except KeyError:
+            kwargs = dict(self.kwargs, step=step)
+            step_url = step_urls[step] = reverse(self.url_name, kwargs=kwargs)
+            return step_url
 
     def get(self, *args, **kwargs):
         """
@@ -552,25 +729,22 @@ class NamedUrlMultipleFormWizardView(MultipleFormWizardView):
         """
         self.ensure_form_list()
 
+        if 'wizard_schema' in self.request.GET:
+            return self.render_schema(self.request.GET['wizard_schema'] or None)
+
         step_url = kwargs.get('step', None)
         if step_url is None:
             if 'reset' in self.request.GET:
                 self.storage.reset()
                 self.storage.current_step = self.steps.first
+            step_url = self.get_step_url(self.steps.current)
             if self.request.GET:
-                query_string = "?%s" % self.request.GET.urlencode()
-            else:
-                query_string = ""
-            return redirect(self.get_step_url(self.steps.current)
-                            + query_string)
+                step_url = '%s%s%s' % (step_url, '&' if '?' in step_url else '?', self.request.GET.urlencode())
+            return redirect(step_url)
 
         # is the current step the "done" name/view?
         elif step_url == self.done_step_name:
-            last_step = self.steps.last
-            return self.render_done(self.get_forms(step=last_step,
-                data=self.storage.get_step_data(last_step),
-                files=self.storage.get_step_files(last_step)
-            ), **kwargs)
+            return self.render_done(self.get_stored_forms(self.steps.last), **kwargs)
 
         # is the url step name not equal to the step in the storage?
         # if yes, change the step in the storage (if name exists)
@@ -582,7 +756,10 @@ class NamedUrlMultipleFormWizardView(MultipleFormWizardView):
             ), **kwargs)
 
         elif step_url in self.get_form_list():
-            self.storage.current_step = step_url
+            goto_step = self.get_goto_step(step_url)
+            self.storage.current_step = goto_step
+            if goto_step != step_url:
+                return redirect(self.get_step_url(goto_step))
             return self.render(self.get_forms(
                 data=self.storage.current_step_data,
                 files=self.storage.current_step_files,
@@ -607,11 +784,13 @@ class NamedUrlMultipleFormWizardView(MultipleFormWizardView):
 
     def get_context_data(self, forms, **kwargs):
         """
-        NamedUrlWizardView provides the url_name of this wizard in the context
-        dict `wizard`.
+        NamedUrlWizardView provides the url_name of this wizard and the URLs of
+        its steps (`step_urls`) in the context dict `wizard`.
         """
         context = super(NamedUrlMultipleFormWizardView, self).get_context_data(forms=forms, **kwargs)
         context['wizard']['url_name'] = self.url_name
+        context['wizard']['step_urls'] = OrderedDict(
+            (step, self.get_step_url(step)) for step in self.steps.all)
         return context
 
     def render_next_step(self, form, **kwargs):
@@ -628,6 +807,7 @@ class NamedUrlMultipleFormWizardView(MultipleFormWizardView):
         This method gets called when the current step has to be changed.
         `goto_step` contains the requested step to go to.
         """
+        goto_step = self.get_goto_step(goto_step)
         self.storage.current_step = goto_step
         return redirect(self.get_step_url(goto_step))
 
@@ -653,14 +833,14 @@ class NamedUrlSessionMultipleFormWizardView(NamedUrlMultipleFormWizardView):
     """
     A NamedUrlWizardView with pre-configured SessionStorage backend.
     """
-    storage_name = 'formtools.wizard.storage.session.SessionStorage'
+    storage_name = 'multipleformwizard.storage.session.SessionStorage'
 
 
 class NamedUrlCookieMultipleFormWizardView(NamedUrlMultipleFormWizardView):
     """
     A NamedUrlFormWizard with pre-configured CookieStorageBackend.
     """
-    storage_name = 'formtools.wizard.storage.cookie.CookieStorage'
+    storage_name = 'multipleformwizard.storage.cookie.CookieStorage'
 
 
 
@@ -3,22 +3,44 @@ import sys
 try:
     from django.conf import settings, global_settings
 
+    TEMPLATES = [{
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "APP_DIRS": True,
+    }]
+    try:
+        import jinja2
+    except ImportError:
+        pass
+    else:
+        TEMPLATES.append({
+            "BACKEND": "django.template.backends.jinja2.Jinja2",
+            "APP_DIRS": True,
+            "OPTIONS": {
+                "environment": "multipleformwizard.jinja2env.environment",
+            },
+        })
+
     settings.configure(
         DEBUG=True,
         USE_TZ=True,
+        SECRET_KEY="multipleformwizard-tests",
         DATABASES={
             "default": {
                 "ENGINE": "django.db.backends.sqlite3",
             }
         },
-        ROOT_URLCONF="multipleformwizard.urls",
+        ROOT_URLCONF="tests.urls",
         INSTALLED_APPS=[
             "django.contrib.auth",
             "django.contrib.contenttypes",
+            "django.contrib.sessions",
             "django.contrib.sites",
             "multipleformwizard",
         ],
-        MIDDLEWARE_CLASSES=global_settings.MIDDLEWARE_CLASSES,
+        MIDDLEWARE_CLASSES=global_settings.MIDDLEWARE_CLASSES + (
+            "django.contrib.sessions.middleware.SessionMiddleware",
+        ),
+        TEMPLATES=TEMPLATES,
         SITE_ID=1,
         NOSE_ARGS=['-s'],
     )
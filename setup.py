@@ -34,6 +34,9 @@ setup(
     url='https://github.com/vikingco/django-multipleformwizard',
     packages=[
         'multipleformwizard',
+        'multipleformwizard.management',
+        'multipleformwizard.management.commands',
+        'multipleformwizard.storage',
     ],
     include_package_data=True,
     install_requires=[
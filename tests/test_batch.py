@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-multipleformwizard
+------------
+
+Tests for `django-multipleformwizard` batch module.
+"""
+
+import unittest
+
+from django import forms
+
+from multipleformwizard import views
+from multipleformwizard.batch import BatchValidator, validate_records
+
+
+class NameForm(forms.Form):
+    name = forms.CharField(max_length=10)
+
+
+class AgeForm(forms.Form):
+    age = forms.IntegerField(min_value=0)
+
+
+class CityForm(forms.Form):
+    city = forms.CharField()
+
+
+def show_city(wizard):
+    data = wizard.get_cleaned_data_for_step('account') or {}
+    return data.get('person', {}).get('age', 0) >= 18
+
+
+class BatchWizard(views.MultipleFormWizardView):
+    form_list = [
+        ('start', NameForm),
+        ('account', (
+            ('person', AgeForm),
+            ('address', CityForm),
+        )),
+        ('extra', CityForm),
+    ]
+    condition_dict = {'extra': show_city}
+
+
+class TestBatchValidator(unittest.TestCase):
+
+    def setUp(self):
+        self.validator = BatchValidator(BatchWizard)
+
+    def test_valid_record(self):
+        result = self.validator.validate({
+            'start': {'name': 'John'},
+            'account': {'person': {'age': '12'}, 'address': {'city': 'Ghent'}},
+        })
+        self.assertTrue(result.is_valid)
+        self.assertEqual(list(result.cleaned_data), ['start', 'account'])
+        self.assertEqual(result.cleaned_data['account']['person'], {'age': 12})
+
+    def test_condition(self):
+        result = self.validator.validate({
+            'start': {'name': 'John'},
+            'account': {'person': {'age': '42'}, 'address': {'city': 'Ghent'}},
+        })
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.errors, {'extra': None})
+
+    def test_errors(self):
+        result = self.validator.validate({
+            'start': {'name': 'A very long name'},
+            'account': {'person': {'age': '-1'}, 'address': {'city': 'Ghent'}},
+        })
+        self.assertEqual(list(result.errors), ['start', 'account'])
+        self.assertIn('name', result.errors['start'])
+        self.assertEqual(list(result.errors['account']), ['person'])
+
+    def test_validate_records(self):
+        records = [
+            {'start': {'name': 'John'}, 'account': {'person': {'age': 1}, 'address': {'city': 'X'}}},
+            {'start': {'name': 'Jane'}},
+        ]
+        results = list(validate_records(BatchWizard, records))
+        self.assertEqual([result.index for result in results], [0, 1])
+        self.assertEqual([result.is_valid for result in results], [True, False])
+
+    def test_processes(self):
+        records = [{'start': {'name': 'John' if index % 3 else 'A very long name'}} for index in range(12)]
+        results = list(validate_records(BatchWizard, records, processes=2, chunksize=2))
+        self.assertEqual([result.index for result in results], list(range(12)))
+        self.assertEqual([list(result.errors) for result in results],
+                         [['start', 'account'] if index % 3 == 0 else ['account'] for index in range(12)])
+
+        # Closing the generator shuts the pool down
+        results = validate_records(BatchWizard, records, processes=2)
+        self.assertEqual(next(results).index, 0)
+        results.close()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-multipleformwizard
+------------
+
+Tests for `django-multipleformwizard` checks module.
+"""
+
+import unittest
+
+import mock
+from django import forms
+from django.core.urlresolvers import clear_url_caches, get_resolver
+from django.utils import translation
+
+from multipleformwizard import checks, views
+
+from .wizards import NameForm, NamedUrlTestWizard, TestWizard
+
+
+class UploadForm(forms.Form):
+    upload = forms.FileField()
+
+
+class UploadWizard(views.SessionMultipleFormWizardView):
+    form_list = [('start', NameForm), ('upload', UploadForm)]
+
+
+class NoUrlNameWizard(views.NamedUrlSessionMultipleFormWizardView):
+    form_list = [NameForm]
+
+
+class DoneStepWizard(views.NamedUrlSessionMultipleFormWizardView):
+    form_list = [('start', NameForm), ('done', NameForm)]
+    url_name = 'done_step_wizard'
+
+
+class ConditionWizard(views.SessionMultipleFormWizardView):
+    form_list = [('start', NameForm)]
+    condition_dict = {'confirm': False}
+
+
+class TestChecks(unittest.TestCase):
+
+    def test_as_view(self):
+        view = TestWizard.as_view()
+        self.assertIs(view.view_class, TestWizard)
+        self.assertEqual(list(view.view_initkwargs['form_list']), ['start', 'account'])
+
+    def test_get_url_wizards(self):
+        url_wizards = [view_class for view_class, initkwargs in checks.get_url_wizards()]
+        self.assertIn(TestWizard, url_wizards)
+        self.assertIn(NamedUrlTestWizard, url_wizards)
+
+    def test_check_wizards(self):
+        errors = sorted((error.id, error.obj.__name__) for error in checks.check_wizards())
+        self.assertEqual(errors, [
+            ('multipleformwizard.E001', 'UploadWizard'),
+            ('multipleformwizard.E002', 'DoneStepWizard'),
+            ('multipleformwizard.E002', 'NoUrlNameWizard'),
+            ('multipleformwizard.W001', 'ConditionWizard'),
+        ])
+
+    def test_warm_up(self):
+        clear_url_caches()
+        resolver = get_resolver(None)
+        self.assertNotIn(translation.get_language(), resolver._reverse_dict)
+        checks.warm_up()
+        self.assertIs(get_resolver(None), resolver)
+        self.assertIn(translation.get_language(), resolver._reverse_dict)
+
+        # The wizards are found without importing the URLconf again
+        with mock.patch('django.core.urlresolvers.import_module', side_effect=AssertionError):
+            url_wizards = [view_class for view_class, initkwargs in checks.get_url_wizards()]
+        self.assertIn(TestWizard, url_wizards)
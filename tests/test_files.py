@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-multipleformwizard
+------------
+
+Tests for `django-multipleformwizard` file storage.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from django import forms
+from django.core.files.base import ContentFile
+from django.core.management import CommandError, call_command
+from django.utils.six import StringIO
+
+from multipleformwizard import views
+from multipleformwizard.storage.files import ContentHashFileStorage
+
+purge_storage = ContentHashFileStorage(location=os.path.join(tempfile.gettempdir(), 'multipleformwizard-purge'))
+
+
+class UploadForm(forms.Form):
+    upload = forms.FileField()
+
+
+class UploadWizard(views.SessionMultipleFormWizardView):
+    form_list = [UploadForm]
+    file_storage = purge_storage
+
+
+class TestContentHashFileStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.storage = ContentHashFileStorage(location=self.location)
+
+    def test_deduplication(self):
+        first = self.storage.save('a.txt', ContentFile(b'content'))
+        second = self.storage.save('a.txt', ContentFile(b'content'))
+        other = self.storage.save('b.txt', ContentFile(b'other content'))
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.storage.open(second).read(), b'content')
+        self.assertEqual(self.storage.references(first), 2)
+        self.assertEqual(self.storage.references(other), 1)
+
+        self.storage.delete(first)
+        self.assertEqual(self.storage.references(second), 1)
+
+    def test_purge(self):
+        name = self.storage.save('a.txt', ContentFile(b'content'))
+        self.storage.purge_grace_period = -1
+        self.assertEqual(self.storage.purge(), (0, 0))
+
+        self.storage.delete(name)
+        self.assertEqual(self.storage.purge(), (0, 1))
+
+        self.storage.save('a.txt', ContentFile(b'content'))
+        self.assertEqual(self.storage.purge(max_age=-3600), (1, 1))
+        self.assertEqual(os.listdir(self.location), ['.blobs'])
+
+    def tearDown(self):
+        shutil.rmtree(self.location)
+
+
+class TestPurgeWizardFiles(unittest.TestCase):
+
+    def purge(self, *args, **options):
+        stdout = StringIO()
+        call_command('purge_wizard_files', *args, stdout=stdout, **options)
+        return stdout.getvalue().strip()
+
+    def test_storage_path(self):
+        purge_storage.save('a.txt', ContentFile(b'content'))
+        self.assertEqual(self.purge('tests.test_files.purge_storage'),
+                         'tests.test_files.purge_storage: deleted 0 uploads and 0 unreferenced files.')
+        # The unreferenced content is kept during the grace period
+        self.assertEqual(self.purge('tests.test_files.purge_storage', max_age=-1),
+                         'tests.test_files.purge_storage: deleted 1 uploads and 0 unreferenced files.')
+
+    def test_view_path(self):
+        purge_storage.save('a.txt', ContentFile(b'content'))
+        self.assertEqual(self.purge('tests.test_files.UploadWizard', max_age=-1),
+                         'tests.test_files.UploadWizard: deleted 1 uploads and 0 unreferenced files.')
+
+    def test_errors(self):
+        self.assertRaisesRegexp(CommandError, 'at least one storage path', self.purge)
+        self.assertRaisesRegexp(CommandError, 'Cannot import tests.test_files.missing', self.purge,
+                                'tests.test_files.missing')
+        self.assertRaisesRegexp(CommandError, 'tests.wizards.TestWizard is not a ContentHashFileStorage',
+                                self.purge, 'tests.wizards.TestWizard')
+
+    def tearDown(self):
+        shutil.rmtree(purge_storage.location, ignore_errors=True)
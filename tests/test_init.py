@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-multipleformwizard
+------------
+
+Tests for `django-multipleformwizard` package imports.
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+import multipleformwizard
+from multipleformwizard import views
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestPackageImport(unittest.TestCase):
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'lazy imports require module __getattr__')
+    def test_lazy_import(self):
+        output = subprocess.check_output([
+            sys.executable, '-c',
+            'import sys, multipleformwizard; print(sorted(m for m in sys.modules if m.startswith("formtools")))'
+        ], cwd=ROOT)
+        self.assertEqual(output.decode('ascii').strip(), '[]')
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'lazy imports require module __getattr__')
+    def test_setup(self):
+        output = subprocess.check_output([
+            sys.executable, '-c',
+            'import sys, django; from django.conf import settings; '
+            'settings.configure(INSTALLED_APPS=["multipleformwizard"]); django.setup(); '
+            'print(sorted(m for m in sys.modules if m.startswith("formtools")))'
+        ], cwd=ROOT)
+        self.assertEqual(output.decode('ascii').strip(), '[]')
+
+    def test_views(self):
+        for name in multipleformwizard.__all__:
+            self.assertIs(getattr(multipleformwizard, name), getattr(views, name))
+        with self.assertRaises(AttributeError):
+            multipleformwizard.UnknownView
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-multipleformwizard
+------------
+
+Tests for `django-multipleformwizard` instances module.
+"""
+
+from django.contrib.auth.models import Group
+from django.core.exceptions import ImproperlyConfigured
+from django.test import RequestFactory, TestCase
+
+from .wizards import InstancesTestWizard
+
+PREFIX = 'instances_test_wizard'
+
+
+class TestMultipleInstances(TestCase):
+
+    def setUp(self):
+        self.group = Group.objects.create(name='staff')
+
+    def start(self):
+        response = self.client.get('/instances-wizard/')
+        return response.context['wizard']['management_form'].initial
+
+    def post(self, management, step, data):
+        data = dict(data)
+        data.update({
+            '%s-current_step' % PREFIX: step,
+            '%s-instance_id' % PREFIX: management['instance_id'],
+            '%s-version' % PREFIX: management['version'],
+        })
+        return self.client.post('/instances-wizard/', data)
+
+    def test_instances(self):
+        first, second = self.start(), self.start()
+        self.assertNotEqual(first['instance_id'], second['instance_id'])
+        self.assertEqual(first['version'], 0)
+
+        response = self.post(first, 'start', {'start-name': 'John'})
+        self.assertEqual(response.context['wizard']['steps'].current, 'account')
+        self.assertEqual(response.context['wizard']['management_form'].initial['version'], 1)
+
+        # The other instance is still at the first step
+        response = self.post(second, 'start', {'start-name': 'toolongname'})
+        self.assertEqual(response.context['wizard']['steps'].current, 'start')
+        self.assertFalse(response.context['wizard']['conflict'])
+
+        response = self.post(dict(first, version=1), 'account', {
+            'account-group': self.group.pk, 'account-city': 'Ghent'})
+        self.assertTrue(response.context['done'])
+
+    def test_conflict(self):
+        management = self.start()
+        self.post(management, 'start', {'start-name': 'John'})
+
+        # Submitting the first step again from an outdated page
+        response = self.post(management, 'start', {'start-name': 'Jane'})
+        self.assertTrue(response.context['wizard']['conflict'])
+        self.assertEqual(response.context['wizard']['steps'].current, 'account')
+        self.assertEqual(response.context['wizard']['management_form'].initial['version'], 1)
+
+    def test_instance_limit(self):
+        instance_ids = [self.start()['instance_id'] for i in range(3)]
+        session = self.client.session
+        self.assertEqual(session['wizard_%s_instances' % PREFIX], instance_ids[1:])
+        self.assertNotIn('wizard_%s_%s' % (PREFIX, instance_ids[0]), session)
+        self.assertIn('wizard_%s_%s' % (PREFIX, instance_ids[2]), session)
+
+    def test_schema(self):
+        instance_id = self.start()['instance_id']
+        for i in range(2):
+            response = self.client.get('/instances-wizard/?wizard_schema=start')
+            self.assertEqual(response.status_code, 200)
+        # Schema requests don't start instances
+        session = self.client.session
+        self.assertEqual(session['wizard_%s_instances' % PREFIX], [instance_id])
+        self.assertEqual(sorted(key for key in session.keys() if key.startswith('wizard_%s_' % PREFIX)),
+                         sorted(['wizard_%s_instances' % PREFIX, 'wizard_%s_%s' % (PREFIX, instance_id)]))
+
+    def test_no_session(self):
+        request = RequestFactory().get('/instances-wizard/')
+        self.assertRaises(ImproperlyConfigured, InstancesTestWizard.as_view(), request)
+
+
+class TestNamedUrlMultipleInstances(TestCase):
+
+    def test_step_urls(self):
+        response = self.client.get('/named-instances-wizard/', follow=True)
+        management = response.context['wizard']['management_form'].initial
+        step_url = 'http://testserver/named-instances-wizard/start/?named_url_instances_test_wizard-instance_id=%s' % (
+            management['instance_id'])
+        self.assertEqual(response.redirect_chain[-1][0], step_url)
+
+        response = self.client.post(step_url, {
+            'named_url_instances_test_wizard-current_step': 'start',
+            'named_url_instances_test_wizard-instance_id': management['instance_id'],
+            'named_url_instances_test_wizard-version': 0,
+            'start-name': 'John'}, follow=True)
+        self.assertEqual(response.redirect_chain[-1][0], step_url.replace('/start/', '/account/'))
+        self.assertEqual(response.context['wizard']['management_form'].initial['version'], 1)
+
+    def test_conflict(self):
+        response = self.client.get('/named-instances-wizard/', follow=True)
+        management = response.context['wizard']['management_form'].initial
+        step_url = response.redirect_chain[-1][0]
+        data = {
+            'named_url_instances_test_wizard-current_step': 'start',
+            'named_url_instances_test_wizard-instance_id': management['instance_id'],
+            'named_url_instances_test_wizard-version': 0,
+            'start-name': 'John'}
+        response = self.client.post(step_url, data, follow=True)
+        self.assertFalse(response.context['wizard']['conflict'])
+
+        # Submitting the first step again from an outdated page
+        response = self.client.post(step_url, dict(data, **{'start-name': 'Jane'}), follow=True)
+        self.assertEqual(response.redirect_chain[-1][0], step_url.replace('/start/', '/account/'))
+        self.assertTrue(response.context['wizard']['conflict'])
+
+        # The flag is only shown once
+        response = self.client.get(response.redirect_chain[-1][0])
+        self.assertFalse(response.context['wizard']['conflict'])
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-multipleformwizard
+------------
+
+Tests for `django-multipleformwizard` metrics module.
+"""
+
+import threading
+
+from django.contrib.auth.models import Group
+from django.test import RequestFactory, TestCase
+
+from multipleformwizard.metrics import MetricsRegistry
+
+from .wizards import MetricsTestWizard
+
+
+class TestMetricsRegistry(TestCase):
+
+    def test_threads(self):
+        metrics = MetricsRegistry(buckets=(1.0,))
+
+        def work():
+            for i in range(100):
+                metrics.inc('multipleformwizard_done_total', ('Wizard',))
+            metrics.observe('multipleformwizard_step_duration_seconds', ('Wizard', 'start'), 2.0)
+
+        threads = [threading.Thread(target=work) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        exported = metrics.export()
+        self.assertIn('multipleformwizard_done_total{wizard="Wizard"} 400\n', exported)
+        self.assertIn('multipleformwizard_step_duration_seconds_bucket{wizard="Wizard",step="start",le="1.0"} 0\n',
+                      exported)
+        self.assertIn('multipleformwizard_step_duration_seconds_count{wizard="Wizard",step="start"} 4\n', exported)
+
+    def test_finished_threads(self):
+        metrics = MetricsRegistry(buckets=(1.0,))
+
+        def work():
+            metrics.inc('multipleformwizard_done_total', ('Wizard',))
+            metrics.observe('multipleformwizard_step_duration_seconds', ('Wizard', 'start'), 0.5)
+
+        for i in range(50):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+        # The shards of finished threads are retired when a thread is added,
+        # only the shards of this thread and the last one are left
+        self.assertEqual(len(metrics._shards), 2)
+
+        counters, histograms = metrics.collect()
+        self.assertEqual([shard[0] for shard in metrics._shards], [threading.current_thread()])
+        self.assertEqual(counters[('multipleformwizard_done_total', ('Wizard',))], 50)
+        self.assertEqual(histograms[('multipleformwizard_step_duration_seconds', ('Wizard', 'start'))],
+                         [50, 0, 25.0])
+
+        metrics.reset()
+        self.assertEqual(metrics.collect(), ({}, {}))
+
+    def test_wizard(self):
+        metrics = MetricsTestWizard.metrics
+        metrics.reset()
+        group = Group.objects.create(name='staff')
+        self.client.get('/metrics-wizard/')
+        for data in ({'start-name': 'A very long name'}, {'start-name': 'John'}):
+            data['metrics_test_wizard-current_step'] = 'start'
+            self.client.post('/metrics-wizard/', data)
+        self.client.post('/metrics-wizard/', {
+            'metrics_test_wizard-current_step': 'account', 'account-group': group.pk, 'account-city': 'X'})
+
+        counters, histograms = metrics.collect()
+        self.assertEqual(counters, {
+            ('multipleformwizard_step_renders_total', ('tests.wizards.MetricsTestWizard', 'start')): 2,
+            ('multipleformwizard_step_renders_total', ('tests.wizards.MetricsTestWizard', 'account')): 1,
+            ('multipleformwizard_step_submissions_total', ('tests.wizards.MetricsTestWizard', 'start', 'invalid')): 1,
+            ('multipleformwizard_step_submissions_total', ('tests.wizards.MetricsTestWizard', 'start', 'valid')): 1,
+            ('multipleformwizard_step_submissions_total', ('tests.wizards.MetricsTestWizard', 'account', 'valid')): 1,
+            ('multipleformwizard_form_validations_total', ('tests.wizards.MetricsTestWizard', 'start', '', 'invalid')): 1,
+            ('multipleformwizard_form_validations_total', ('tests.wizards.MetricsTestWizard', 'start', '', 'valid')): 1,
+            ('multipleformwizard_form_validations_total', ('tests.wizards.MetricsTestWizard', 'account', 'membership', 'valid')): 1,
+            ('multipleformwizard_form_validations_total', ('tests.wizards.MetricsTestWizard', 'account', 'address', 'valid')): 1,
+            ('multipleformwizard_done_total', ('tests.wizards.MetricsTestWizard',)): 1,
+        })
+        self.assertEqual(len(histograms), 2)
+
+    def test_metrics_name(self):
+        metrics = MetricsTestWizard.metrics
+        metrics.reset()
+        view = MetricsTestWizard.as_view(metrics_name='signup')
+        view(RequestFactory().get('/metrics-wizard/'))
+        counters, histograms = metrics.collect()
+        self.assertEqual(counters[('multipleformwizard_step_renders_total', ('signup', 'start'))], 1)
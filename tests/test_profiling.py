@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-multipleformwizard
+------------
+
+Tests for `django-multipleformwizard` profiling module.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from collections import OrderedDict
+
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from multipleformwizard import profiling
+
+from .wizards import ProfilingTestWizard
+
+
+@unittest.skipIf(profiling.tracemalloc is None, 'tracemalloc is not available')
+class TestMemoryProfilingMixin(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def test_disabled(self):
+        response = self.client.get('/profiling-wizard/')
+        self.assertIsNone(response.context['view'].memory_profile)
+
+    def test_profile(self):
+        with override_settings(MULTIPLEFORMWIZARD_MEMORY_PROFILING=True,
+                               MULTIPLEFORMWIZARD_MEMORY_PROFILING_DIR=self.directory):
+            response = self.client.post('/profiling-wizard/', {
+                'profiling_test_wizard-current_step': 'start', 'start-name': 'John'})
+
+        profile = response.context['view'].memory_profile
+        self.assertEqual(list(profile), [
+            ('get_forms', 'start'), ('get_forms', 'account'), ('render', 'account'),
+            ('post', 'start'), ('dispatch', None)])
+        self.assertTrue(profile[('dispatch', None)].peak >= profile[('render', 'account')].peak > 0)
+        self.assertEqual(len(os.listdir(self.directory)), 1)
+
+    def test_header(self):
+        with override_settings(DEBUG=True):
+            response = self.client.get('/profiling-wizard/', HTTP_X_WIZARD_MEMORY_PROFILE='1')
+        self.assertIn(('get', 'start'), response.context['view'].memory_profile)
+
+    def test_tracing(self):
+        tracing = profiling.tracemalloc.is_tracing()
+        profiling._start_tracing()
+        profiling._start_tracing()
+        profiling._stop_tracing()
+        # Another request is still profiled
+        self.assertTrue(profiling.tracemalloc.is_tracing())
+        profiling._stop_tracing()
+        self.assertEqual(profiling.tracemalloc.is_tracing(), tracing)
+
+    @unittest.skipIf(not hasattr(profiling.tracemalloc, 'reset_peak'), 'tracemalloc.reset_peak is not available')
+    def test_nested_peak(self):
+        view = ProfilingTestWizard()
+        view.memory_profile = OrderedDict()
+        view._memory_stack = []
+
+        def allocate(size, step=None):
+            data = bytearray(size)
+            del data
+
+        def outer():
+            allocate(10 * 1024 * 1024)
+            view._profile_phase('get_forms', allocate, (1024,), {'step': 'start'})
+
+        profiling._start_tracing()
+        try:
+            view._profile_phase('dispatch', outer, (), {})
+        finally:
+            profiling._stop_tracing()
+        # The peak before the nested phase is kept
+        self.assertTrue(view.memory_profile[('dispatch', None)].peak >= 10 * 1024 * 1024)
+        self.assertTrue(view.memory_profile[('get_forms', 'start')].peak < 1024 * 1024)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
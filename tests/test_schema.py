@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-multipleformwizard
+------------
+
+Tests for `django-multipleformwizard` schema module.
+"""
+
+import json
+import re
+
+from django import forms
+from django.test import TestCase
+
+from multipleformwizard.schema import get_form_schema
+
+
+class PostcodeForm(forms.Form):
+    postcode = forms.RegexField(regex=r'^\d{4}$', max_length=4)
+    country = forms.ChoiceField(choices=[('BE', 'Belgium'), ('Other', [('NL', 'Netherlands')])])
+    count = forms.IntegerField(required=False, min_value=1, max_value=9)
+
+
+class ValidatorForm(forms.Form):
+    url = forms.URLField()
+    slug = forms.SlugField()
+    ip = forms.GenericIPAddressField(protocol='ipv4')
+    code = forms.RegexField(regex=re.compile(r'\A[a-z]+\Z', re.IGNORECASE))
+
+
+class TestSchema(TestCase):
+
+    def test_form_schema(self):
+        schema = get_form_schema(PostcodeForm)
+        self.assertIs(get_form_schema(PostcodeForm), schema)
+        fields = schema['fields']
+        self.assertEqual(list(fields), ['postcode', 'country', 'count'])
+        self.assertEqual(fields['postcode']['max_length'], 4)
+        self.assertEqual(fields['postcode']['regex'], [{'pattern': r'^\d{4}$', 'flags': '', 'inverse_match': False}])
+        self.assertEqual(fields['country']['choices'], ['BE', 'NL'])
+        self.assertEqual(fields['count'], {
+            'type': 'IntegerField', 'required': False, 'min_value': 1, 'max_value': 9})
+
+    def test_validator_regexes(self):
+        fields = get_form_schema(ValidatorForm)['fields']
+        self.assertEqual(fields['slug']['regex'], [{'pattern': '^[-a-zA-Z0-9_]+$', 'flags': '', 'inverse_match': False}])
+        self.assertTrue(fields['ip']['regex'][0]['pattern'].endswith('{3}$'))
+        self.assertEqual(fields['code']['regex'][0]['flags'], 'i')
+        # The pattern of URLValidator has lookbehinds
+        self.assertNotIn('regex', fields['url'])
+
+    def test_formset_schema(self):
+        schema = get_form_schema(forms.formset_factory(PostcodeForm, max_num=3))
+        self.assertTrue(schema['formset'])
+        self.assertEqual(schema['max_num'], 3)
+
+    def test_schema_view(self):
+        response = self.client.get('/wizard/?wizard_schema=account')
+        schema = json.loads(response.content.decode('utf-8'))
+        self.assertEqual(list(schema), ['membership', 'address'])
+        self.assertEqual(schema['address']['prefix'], 'account')
+        self.assertEqual(schema['address']['fields']['city']['type'], 'CharField')
+
+        response = self.client.get('/wizard/?wizard_schema')
+        self.assertEqual(list(json.loads(response.content.decode('utf-8'))), ['start', 'account'])
+        self.assertEqual(self.client.get('/wizard/?wizard_schema=unknown').status_code, 404)
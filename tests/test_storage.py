@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-multipleformwizard
+------------
+
+Tests for `django-multipleformwizard` storage module.
+"""
+
+import re
+import shutil
+import tempfile
+import unittest
+
+from django.contrib.auth.models import Group
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+
+from multipleformwizard.storage.cookie import CookieStorage
+from multipleformwizard.storage.hidden import HiddenFieldStorage
+
+
+class TestCachedReadStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.storage = CookieStorage('wizard', RequestFactory().get('/'))
+
+    def test_step_data(self):
+        self.storage.set_step_data('start', {'start-name': ['John']})
+        data = self.storage.get_step_data('start')
+        self.assertIs(self.storage.get_step_data('start'), data)
+        self.assertEqual(data['start-name'], 'John')
+
+        self.storage.set_step_data('start', {'start-name': ['Jane']})
+        self.assertEqual(self.storage.get_step_data('start')['start-name'], 'Jane')
+
+    def test_reset(self):
+        self.storage.set_step_data('start', {'start-name': ['John']})
+        self.storage.get_step_data('start')
+        self.storage.reset()
+        self.assertIsNone(self.storage.get_step_data('start'))
+
+    def test_step_files(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        storage = CookieStorage('wizard', RequestFactory().get('/'), FileSystemStorage(location=directory))
+
+        storage.set_step_files('upload', {'upload-file': SimpleUploadedFile('a.txt', b'first')})
+        files = storage.get_step_files('upload')
+        self.assertIs(storage.get_step_files('upload'), files)
+        first_file = files['upload-file']
+        self.assertEqual(first_file.read(), b'first')
+
+        # Replacing the files of the step reopens them, the replaced file is
+        # closed at the end of the response
+        storage.set_step_files('upload', {'upload-file': SimpleUploadedFile('b.txt', b'second')})
+        second_file = storage.get_step_files('upload')['upload-file']
+        self.assertIsNot(second_file, first_file)
+        self.assertEqual(second_file.read(), b'second')
+        self.assertFalse(first_file.closed)
+
+        storage.update_response(HttpResponse())
+        self.assertTrue(first_file.closed)
+        self.assertTrue(second_file.closed)
+
+
+class TestHiddenFieldStorage(TestCase):
+
+    def post(self, response, data):
+        state = re.search(r'name="wizard_hidden_field_test_wizard" value="([^"]+)"',
+                          response.content.decode('utf-8')).group(1)
+        data['wizard_hidden_field_test_wizard'] = state
+        return self.client.post('/hidden-wizard/', data)
+
+    def test_wizard(self):
+        group = Group.objects.create(name='staff')
+        response = self.client.get('/hidden-wizard/')
+        response = self.post(response, {
+            'hidden_field_test_wizard-current_step': 'start', 'start-name': 'John'})
+        self.assertEqual(response.context['wizard']['steps'].current, 'account')
+        response = self.post(response, {
+            'hidden_field_test_wizard-current_step': 'account', 'account-group': group.pk, 'account-city': 'X'})
+        self.assertTrue(response.context['done'])
+        self.assertNotIn('wizard_hidden_field_test_wizard', self.client.cookies)
+
+    def test_tampered_state(self):
+        response = self.client.post('/hidden-wizard/', {
+            'hidden_field_test_wizard-current_step': 'account',
+            'wizard_hidden_field_test_wizard': 'tampered'})
+        # The state is ignored, so the wizard starts over
+        self.assertEqual(response.context['wizard']['steps'].current, 'start')
+        self.assertIsNone(response.context['view'].storage.get_step_data('start'))
+
+    def test_other_wizard_state(self):
+        storage = HiddenFieldStorage('other_wizard', RequestFactory().get('/'))
+        storage.set_step_data('start', {'start-name': ['John']})
+        request = RequestFactory().post('/', {'wizard_hidden_field_test_wizard': storage.dump_data()})
+        self.assertIsNone(HiddenFieldStorage('hidden_field_test_wizard', request).get_step_data('start'))
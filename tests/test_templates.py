@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-multipleformwizard
+------------
+
+Tests for `django-multipleformwizard` templates.
+"""
+
+import re
+import unittest
+
+from django.contrib.auth.models import Group
+from django.test import TestCase
+
+try:
+    import jinja2
+except ImportError:
+    jinja2 = None
+
+
+def normalize(content):
+    content = re.sub(r'<input type=.hidden. name=.csrfmiddlewaretoken. value=\S+ */?>', '', content.decode('utf-8'))
+    return re.sub(r'\s+', ' ', content).strip()
+
+
+@unittest.skipIf(jinja2 is None, 'Jinja2 is not installed')
+class TestJinja2Template(TestCase):
+
+    def setUp(self):
+        Group.objects.create(name='staff')
+
+    def test_equivalent_to_django_template(self):
+        self.assertEqual(normalize(self.client.get('/jinja2-wizard/').content),
+                         normalize(self.client.get('/wizard/').content))
+
+        response = self.client.post('/jinja2-wizard/', {'test_wizard-current_step': 'start', 'start-name': 'John'})
+        self.assertContains(response, 'name="account-group"')
+        self.assertContains(response, 'name="account-city"')
+        self.assertContains(response, 'value="start">first step</button>')
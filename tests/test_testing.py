@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-multipleformwizard
+------------
+
+Tests for `django-multipleformwizard` testing module.
+"""
+
+from django.contrib.auth.models import Group
+from django.test import TestCase
+
+from multipleformwizard.testing import WizardQueryBudgetMixin, WizardQueryProfiler
+
+from .wizards import NamedUrlTestWizard, TestWizard
+
+
+class TestWizardQueryProfiler(WizardQueryBudgetMixin, TestCase):
+
+    def setUp(self):
+        self.group = Group.objects.create(name='staff')
+        self.steps = [
+            ('start', {'start-name': 'John'}),
+            ('account', {'account-group': self.group.pk, 'account-city': 'Ghent'}),
+        ]
+
+    def test_profile(self):
+        profile = WizardQueryProfiler(TestWizard, '/wizard/', client=self.client).run(self.steps)
+        self.assertEqual([(q.method, q.step) for q in profile],
+                         [('GET', 'start'), ('POST', 'start'), ('POST', 'account')])
+        # Rendering the account step lists the groups
+        self.assertEqual(profile[1].phases['render'], 1)
+        # Validating the account step, revalidating it in render_done
+        self.assertEqual(profile[2].total, 2)
+        self.assertEqual(sum(profile[2].phases.values()), 2)
+        self.assertNotIn('get_forms', TestWizard.__dict__)
+
+    def test_named_url_profile(self):
+        profile = WizardQueryProfiler(NamedUrlTestWizard, '/named-wizard/', client=self.client).run(self.steps)
+        self.assertEqual([q.total for q in profile], [0, 1, 2])
+
+    def test_budgets(self):
+        self.assertWizardQueryBudgets(TestWizard, '/wizard/', self.steps, budgets={'start': 1, 'account': 2})
+        with self.assertRaises(AssertionError):
+            self.assertWizardQueryBudgets(TestWizard, '/wizard/', self.steps, budgets={'account': 1})
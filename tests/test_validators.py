@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-multipleformwizard
+------------
+
+Tests for `django-multipleformwizard` validators module.
+"""
+
+import gc
+import unittest
+import weakref
+
+from django import forms
+
+from multipleformwizard.validators import ValidatorCache, cached_clean
+
+lookups = []
+cache = ValidatorCache(max_size=2)
+
+
+class VatForm(forms.Form):
+    vat_number = forms.CharField()
+
+    @cached_clean(cache=cache, normalize=lambda value: value.replace(' ', '').upper())
+    def clean_vat_number(self):
+        vat_number = self.cleaned_data['vat_number']
+        lookups.append(vat_number)
+        if not vat_number.upper().startswith('BE'):
+            raise forms.ValidationError('Unknown VAT number.')
+        return vat_number.upper()
+
+
+class CodesForm(forms.Form):
+    codes = forms.CharField()
+
+    @cached_clean(cache=cache)
+    def clean_codes(self):
+        raise forms.ValidationError({'codes': ['Unknown code.']})
+
+
+class TestCachedClean(unittest.TestCase):
+
+    def setUp(self):
+        cache.clear()
+        del lookups[:]
+
+    def test_cached_result(self):
+        self.assertTrue(VatForm({'vat_number': 'be 123'}).is_valid())
+        form = VatForm({'vat_number': 'BE123'})
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data['vat_number'], 'BE 123')
+        self.assertEqual(lookups, ['be 123'])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_cached_error(self):
+        for i in range(2):
+            form = VatForm({'vat_number': 'NL123'})
+            self.assertEqual(form.errors['vat_number'], ['Unknown VAT number.'])
+        self.assertEqual(lookups, ['NL123'])
+
+    def test_cached_error_releases_form(self):
+        form = VatForm({'vat_number': 'NL123'})
+        self.assertFalse(form.is_valid())
+        form_ref = weakref.ref(form)
+        del form
+        gc.collect()
+        self.assertIsNone(form_ref())
+
+    def test_cached_error_dict(self):
+        form = CodesForm({'codes': 'X'})
+        form.cleaned_data = {'codes': 'X'}
+        for i in range(2):
+            with self.assertRaises(forms.ValidationError) as context:
+                form.clean_codes()
+            self.assertEqual(context.exception.message_dict, {'codes': ['Unknown code.']})
+
+    def test_eviction(self):
+        for vat_number in ('BE1', 'BE2', 'BE3', 'BE1'):
+            VatForm({'vat_number': vat_number}).is_valid()
+        self.assertEqual(lookups, ['BE1', 'BE2', 'BE3', 'BE1'])
+
+    def test_timeout(self):
+        cache.timeout = -1
+        try:
+            VatForm({'vat_number': 'BE1'}).is_valid()
+            VatForm({'vat_number': 'BE1'}).is_valid()
+        finally:
+            cache.timeout = 300
+        self.assertEqual(lookups, ['BE1', 'BE1'])
@@ -12,8 +12,14 @@ import os
 import shutil
 import unittest
 
+from django.contrib.auth.models import Group
+from django.test import TestCase
+from django.utils import translation
+
 from multipleformwizard import views
 
+from .wizards import NamedUrlTestWizard
+
 
 class TestMultipleFormWizardViews(unittest.TestCase):
 
@@ -25,3 +31,105 @@ class TestMultipleFormWizardViews(unittest.TestCase):
 
     def tearDown(self):
         pass
+
+
+class TestNamedUrlMultipleFormWizardView(TestCase):
+
+    def setUp(self):
+        self.group = Group.objects.create(name='staff')
+
+    def test_wizard(self):
+        response = self.client.get('/named-wizard/', follow=True)
+        self.assertEqual(response.redirect_chain[-1][0], 'http://testserver/named-wizard/start/')
+        self.assertEqual(response.context['wizard']['step_urls'], {
+            'start': '/named-wizard/start/', 'account': '/named-wizard/account/'})
+
+        response = self.client.post('/named-wizard/start/', {
+            'named_url_test_wizard-current_step': 'start', 'start-name': 'John'}, follow=True)
+        self.assertEqual(response.redirect_chain[-1][0], 'http://testserver/named-wizard/account/')
+
+        response = self.client.post('/named-wizard/account/', {
+            'named_url_test_wizard-current_step': 'account',
+            'account-group': self.group.pk, 'account-city': 'Ghent'}, follow=True)
+        self.assertEqual(response.redirect_chain[-1][0], 'http://testserver/named-wizard/done/')
+        self.assertTrue(response.context['done'])
+
+    def test_get_step_url(self):
+        view = NamedUrlTestWizard(**NamedUrlTestWizard.get_initkwargs())
+        view.kwargs = {'step': 'start'}
+        self.assertEqual(view.get_step_url('account'), '/named-wizard/account/')
+        self.assertEqual(view.kwargs, {'step': 'start'})
+        self.assertIs(view.get_step_urls(), view.get_step_urls())
+
+        view = NamedUrlTestWizard(**NamedUrlTestWizard.get_initkwargs(url_name='i18n_named_wizard_step'))
+        view.kwargs = {'step': 'start'}
+        with translation.override('fr'):
+            self.assertEqual(view.get_step_url('account'), '/fr/named-wizard/account/')
+        with translation.override('en'):
+            self.assertEqual(view.get_step_url('account'), '/en/named-wizard/account/')
+
+
+class TestGotoStepValidation(TestCase):
+
+    def goto(self, step):
+        response = self.client.post('/goto-wizard/', {'wizard_goto_step': step})
+        return response.context['wizard']['steps'].current
+
+    def test_goto_step(self):
+        self.client.get('/goto-wizard/')
+        self.assertEqual(self.goto('account'), 'start')
+
+        self.client.post('/goto-wizard/', {'goto_test_wizard-current_step': 'start', 'start-name': 'John'})
+        self.assertEqual(self.goto('start'), 'start')
+        self.assertEqual(self.goto('account'), 'account')
+
+    def test_changed_earlier_step(self):
+        def post(data):
+            response = self.client.post('/dependent-goto-wizard/', data)
+            return response.context['wizard']['steps'].current
+
+        self.client.get('/dependent-goto-wizard/')
+        prefix = 'dependent_goto_test_wizard-current_step'
+        self.assertEqual(post({prefix: 'start', 'start-name': 'John'}), 'nickname')
+        self.assertEqual(post({prefix: 'nickname', 'nickname-nickname': 'Johnny'}), 'city')
+
+        # The stored nickname no longer validates with the new name
+        self.assertEqual(post({'wizard_goto_step': 'start'}), 'start')
+        self.assertEqual(post({prefix: 'start', 'start-name': 'Jane'}), 'nickname')
+        self.assertEqual(post({'wizard_goto_step': 'city'}), 'nickname')
+
+
+class TestRenderDone(TestCase):
+
+    def setUp(self):
+        self.group = Group.objects.create(name='staff')
+
+    def test_result(self):
+        self.client.get('/wizard/')
+        self.client.post('/wizard/', {'test_wizard-current_step': 'start', 'start-name': 'John'})
+        response = self.client.post('/wizard/', {
+            'test_wizard-current_step': 'account', 'account-group': self.group.pk, 'account-city': 'Ghent'})
+        form_dict = response.context['form_dict']
+        self.assertEqual(list(form_dict), ['start', 'account'])
+        self.assertEqual(form_dict['start'].cleaned_data, {'name': 'John'})
+        self.assertEqual(list(form_dict['account']), ['membership', 'address'])
+        self.assertIs(form_dict['account', 'address'], form_dict['account']['address'])
+        self.assertIs(form_dict[1], form_dict['account'])
+        self.assertRaises(KeyError, lambda: form_dict['missing'])
+        self.assertFalse(hasattr(form_dict, '__setitem__'))
+
+        form_list = response.context['form_list']
+        self.assertIsInstance(form_list, list)
+        self.assertEqual(len(form_list), 2)
+        self.assertIs(form_list[0], form_dict['start'])
+        self.assertIs(form_list[1], form_dict['account'])
+
+    def test_step_order(self):
+        self.client.get('/many-steps-wizard/')
+        for step in range(11):
+            response = self.client.post('/many-steps-wizard/', {
+                'test_wizard-current_step': str(step), '%d-city' % step: 'City %d' % step})
+        form_dict = response.context['form_dict']
+        self.assertEqual(list(form_dict), [str(step) for step in range(11)])
+        self.assertEqual([form.cleaned_data['city'] for form in response.context['form_list']],
+                         ['City %d' % step for step in range(11)])
@@ -0,0 +1,28 @@
+from django.conf.urls import url
+from django.conf.urls.i18n import i18n_patterns
+
+from .wizards import (CityForm, DependentGotoTestWizard, GotoTestWizard, HiddenFieldTestWizard, InstancesTestWizard,
+                      MetricsTestWizard, NamedUrlInstancesTestWizard, NamedUrlTestWizard, ProfilingTestWizard,
+                      TestWizard)
+
+urlpatterns = [
+    url(r'^wizard/$', TestWizard.as_view(), name='wizard'),
+    url(r'^many-steps-wizard/$', TestWizard.as_view(form_list=[CityForm] * 11), name='many_steps_wizard'),
+    url(r'^jinja2-wizard/$', TestWizard.as_view(template_engine='jinja2'), name='jinja2_wizard'),
+    url(r'^goto-wizard/$', GotoTestWizard.as_view(), name='goto_wizard'),
+    url(r'^dependent-goto-wizard/$', DependentGotoTestWizard.as_view(), name='dependent_goto_wizard'),
+    url(r'^hidden-wizard/$', HiddenFieldTestWizard.as_view(), name='hidden_wizard'),
+    url(r'^metrics-wizard/$', MetricsTestWizard.as_view(), name='metrics_wizard'),
+    url(r'^profiling-wizard/$', ProfilingTestWizard.as_view(), name='profiling_wizard'),
+    url(r'^instances-wizard/$', InstancesTestWizard.as_view(), name='instances_wizard'),
+    url(r'^named-instances-wizard/(?P<step>.+)/$', NamedUrlInstancesTestWizard.as_view(),
+        name='named_instances_wizard_step'),
+    url(r'^named-instances-wizard/$', NamedUrlInstancesTestWizard.as_view(), name='named_instances_wizard'),
+    url(r'^named-wizard/(?P<step>.+)/$', NamedUrlTestWizard.as_view(), name='named_wizard_step'),
+    url(r'^named-wizard/$', NamedUrlTestWizard.as_view(), name='named_wizard'),
+]
+
+urlpatterns += i18n_patterns(
+    url(r'^named-wizard/(?P<step>.+)/$', NamedUrlTestWizard.as_view(url_name='i18n_named_wizard_step'),
+        name='i18n_named_wizard_step'),
+)
@@ -0,0 +1,105 @@
+from django import forms
+from django.contrib.auth.models import Group
+
+from multipleformwizard import views
+from multipleformwizard.instances import MultipleInstancesMixin
+from multipleformwizard.metrics import FunnelMetricsMixin, MetricsRegistry
+from multipleformwizard.profiling import MemoryProfilingMixin
+
+
+class NameForm(forms.Form):
+    name = forms.CharField(max_length=10)
+
+
+class GroupForm(forms.Form):
+    group = forms.ModelChoiceField(queryset=Group.objects.all())
+
+
+class CityForm(forms.Form):
+    city = forms.CharField()
+
+
+class TestWizard(views.CookieMultipleFormWizardView):
+    form_list = [
+        ('start', NameForm),
+        ('account', (
+            ('membership', GroupForm),
+            ('address', CityForm),
+        )),
+    ]
+
+    def done(self, form_list, form_dict, **kwargs):
+        return self.render_to_response({'done': True, 'form_list': form_list, 'form_dict': form_dict})
+
+
+class NamedUrlTestWizard(views.NamedUrlCookieMultipleFormWizardView):
+    form_list = TestWizard.form_list
+    url_name = 'named_wizard_step'
+
+    def done(self, form_list, form_dict, **kwargs):
+        return self.render_to_response({'done': True})
+
+
+class HiddenFieldTestWizard(views.HiddenFieldMultipleFormWizardView):
+    form_list = TestWizard.form_list
+
+    def done(self, form_list, form_dict, **kwargs):
+        return self.render_to_response({'done': True})
+
+
+class MetricsTestWizard(FunnelMetricsMixin, TestWizard):
+    metrics = MetricsRegistry()
+
+
+class GotoTestWizard(TestWizard):
+    validate_goto_step = True
+
+
+class NicknameForm(forms.Form):
+    nickname = forms.CharField()
+
+    def __init__(self, *args, **kwargs):
+        self.name = kwargs.pop('name', None) or ''
+        super(NicknameForm, self).__init__(*args, **kwargs)
+
+    def clean_nickname(self):
+        if not self.cleaned_data['nickname'].startswith(self.name):
+            raise forms.ValidationError('The nickname should start with the name.')
+        return self.cleaned_data['nickname']
+
+
+class DependentGotoTestWizard(views.CookieMultipleFormWizardView):
+    form_list = [
+        ('start', NameForm),
+        ('nickname', NicknameForm),
+        ('city', CityForm),
+    ]
+    validate_goto_step = True
+
+    def get_form_kwargs(self, step=None):
+        if step == 'nickname':
+            return {'name': (self.get_cleaned_data_for_step('start') or {}).get('name')}
+        return {}
+
+    def done(self, form_list, form_dict, **kwargs):
+        return self.render_to_response({'done': True})
+
+
+class ProfilingTestWizard(MemoryProfilingMixin, TestWizard):
+    pass
+
+
+class InstancesTestWizard(MultipleInstancesMixin, views.SessionMultipleFormWizardView):
+    form_list = TestWizard.form_list
+    instance_limit = 2
+
+    def done(self, form_list, form_dict, **kwargs):
+        return self.render_to_response({'done': True})
+
+
+class NamedUrlInstancesTestWizard(MultipleInstancesMixin, views.NamedUrlSessionMultipleFormWizardView):
+    form_list = TestWizard.form_list
+    url_name = 'named_instances_wizard_step'
+
+    def done(self, form_list, form_dict, **kwargs):
+        return self.render_to_response({'done': True})